@@ -0,0 +1,106 @@
+function toggleChatbot() {
+    const chatbot = document.getElementById('chatbotWindow');
+    chatbot.classList.toggle('active');
+}
+
+function handleChatKeyPress(event) {
+    if (event.key === 'Enter') {
+        sendMessage();
+    }
+}
+
+async function sendMessage() {
+    const input = document.getElementById('chatInput');
+    const message = input.value.trim();
+    if (!message) return;
+
+    const messagesDiv = document.getElementById('chatMessages');
+
+    // Add user message
+    const userMsg = document.createElement('div');
+    userMsg.className = 'chat-message user';
+    userMsg.innerHTML = `<div class="chat-bubble"></div>`;
+    userMsg.firstChild.textContent = message;
+    messagesDiv.appendChild(userMsg);
+
+    input.value = '';
+
+    // Show loading
+    const loadingMsg = document.createElement('div');
+    loadingMsg.className = 'chat-message bot';
+    loadingMsg.innerHTML = `<div class="chat-bubble"><div class="loading-spinner"></div></div>`;
+    messagesDiv.appendChild(loadingMsg);
+    messagesDiv.scrollTop = messagesDiv.scrollHeight;
+
+    try {
+        const response = await fetch('/api/chat/stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ message: message })
+        });
+        if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+        // Replace the spinner with the reply bubble and append text as events arrive
+        const bubble = loadingMsg.querySelector('.chat-bubble');
+        bubble.style.whiteSpace = 'pre-line';
+        let started = false;
+        let buffer = '';
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const lines = buffer.slice(0, boundary).split('\n');
+                buffer = buffer.slice(boundary + 2);
+                const event = (lines.find(line => line.startsWith('event: ')) || 'event: message').slice(7);
+                const data = JSON.parse((lines.find(line => line.startsWith('data: ')) || 'data: {}').slice(6));
+                if (event === 'error') throw new Error(data.error);
+                if (data.delta) {
+                    if (!started) {
+                        bubble.textContent = '';
+                        started = true;
+                    }
+                    bubble.textContent += data.delta;
+                    messagesDiv.scrollTop = messagesDiv.scrollHeight;
+                }
+            }
+        }
+        if (!started) throw new Error('Empty response');
+
+    } catch (error) {
+        loadingMsg.remove();
+        const errorMsg = document.createElement('div');
+        errorMsg.className = 'chat-message bot';
+        errorMsg.innerHTML = `<div class="chat-bubble">Sorry, I encountered an error. Please try again.</div>`;
+        messagesDiv.appendChild(errorMsg);
+    }
+}
+
+// One key per internship per page load, so double clicks and retries apply once
+const applyKeys = new Map();
+
+function applyToInternship(internshipId) {
+    if (!applyKeys.has(internshipId)) {
+        applyKeys.set(internshipId, Date.now().toString(36) + Math.random().toString(36).slice(2));
+    }
+    fetch('/api/apply', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': applyKeys.get(internshipId) },
+        body: JSON.stringify({ internship_id: internshipId })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert('Application submitted successfully!');
+            location.reload();
+        } else {
+            alert(data.error || 'Failed to apply');
+        }
+    })
+    .catch(error => alert('Something went wrong'));
+}
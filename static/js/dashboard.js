@@ -0,0 +1,102 @@
+let loading = false;
+let requestSeq = 0;
+let filterTimer = null;
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, ch => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[ch]);
+}
+
+function filterParams() {
+    const params = new URLSearchParams();
+    const search = document.getElementById('searchInput').value.trim();
+    const type = document.getElementById('typeFilter').value;
+    const location = document.getElementById('locationFilter').value;
+    if (search) params.set('search', search);
+    if (type !== 'all') params.set('type', type);
+    if (location !== 'all') params.set('location', location);
+    return params;
+}
+
+function filterInternships() {
+    clearTimeout(filterTimer);
+    filterTimer = setTimeout(() => loadInternships(true), 250);
+}
+
+async function loadInternships(reset) {
+    if (!reset && (loading || !nextCursor)) return;
+    loading = true;
+    const seq = ++requestSeq;
+
+    // Searches return one BM25-ranked page; plain listings page by cursor
+    const params = filterParams();
+    let url;
+    if (params.has('search')) {
+        params.set('q', params.get('search'));
+        params.delete('search');
+        url = '/api/search?' + params.toString();
+    } else {
+        if (!reset) params.set('cursor', nextCursor);
+        url = '/api/internships?' + params.toString();
+    }
+
+    try {
+        const response = await fetch(url);
+        const data = await response.json();
+        if (seq !== requestSeq) return;
+
+        const container = document.getElementById('internshipList');
+        if (reset) container.innerHTML = '';
+        container.insertAdjacentHTML('beforeend', data.internships.map(renderInternship).join(''));
+        if (!container.children.length) {
+            container.innerHTML = `
+                <div class="card text-center py-5">
+                    <i class="fas fa-briefcase fa-4x text-muted mb-3"></i>
+                    <p class="text-muted">No internships found matching your criteria.</p>
+                </div>
+            `;
+        }
+        nextCursor = data.next_cursor || null;
+    } finally {
+        if (seq === requestSeq) {
+            loading = false;
+            document.getElementById('listSentinel').innerHTML = nextCursor ? '<div class="loading-spinner"></div>' : '';
+        }
+    }
+}
+
+function renderInternship(internship) {
+    return `
+        <div class="card mb-3 internship-card">
+            <div class="card-body">
+                <div class="d-flex justify-content-between align-items-start mb-3">
+                    <div>
+                        <h5 class="mb-1">${escapeHtml(internship.title)}</h5>
+                        <p class="text-muted mb-0"><strong>${escapeHtml(internship.company_name)}</strong></p>
+                    </div>
+                    <span class="badge badge-primary">${escapeHtml(internship.type)}</span>
+                </div>
+                <p class="text-muted mb-3">${internship.snippet || escapeHtml(internship.description.substring(0, 200)) + '...'}</p>
+                <div class="d-flex flex-wrap gap-4 mb-3">
+                    <span class="text-muted small"><i class="fas fa-map-marker-alt me-1"></i>${escapeHtml(internship.location)}</span>
+                    <span class="text-muted small"><i class="fas fa-clock me-1"></i>${escapeHtml(internship.duration)} months</span>
+                    ${internship.stipend ? `<span class="text-muted small"><i class="fas fa-rupee-sign me-1"></i>${escapeHtml(internship.stipend)} /month</span>` : ''}
+                </div>
+                <div class="mb-3">
+                    ${internship.skills.map(skill => `<span class="skill-badge">${escapeHtml(skill.name)}</span>`).join('')}
+                </div>
+                <div class="d-flex justify-content-between align-items-center">
+                    <span class="text-muted small">${escapeHtml(internship.applications)} applicants</span>
+                    ${isStudent ? `<button class="btn btn-primary" onclick="applyToInternship('${escapeHtml(internship.id)}')">
+                        Apply Now <i class="fas fa-arrow-right ms-2"></i>
+                    </button>` : ''}
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+new IntersectionObserver(entries => {
+    if (entries.some(entry => entry.isIntersecting)) loadInternships(false);
+}, { rootMargin: '400px' }).observe(document.getElementById('listSentinel'));
@@ -0,0 +1,12 @@
+function toggleStudentFields(role) {
+    const studentFields = document.getElementById('studentFields');
+    studentFields.style.display = role === 'STUDENT' ? 'block' : 'none';
+}
+
+// Initialize student fields visibility
+document.addEventListener('DOMContentLoaded', function() {
+    const roleSelect = document.querySelector('select[name="role"]');
+    if (roleSelect) {
+        toggleStudentFields(roleSelect.value);
+    }
+});
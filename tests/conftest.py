@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import web  # noqa: E402
+
+STUDENT = {'name': 'Asha Rao', 'email': 'asha@college.edu', 'password': 'password123', 'role': 'STUDENT',
+           'college_name': 'Test College', 'college_tier': 'TIER_1', 'year': '3'}
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app on a freshly migrated and seeded database of its own"""
+    monkeypatch.setitem(web.app.config, 'DATABASE', str(tmp_path / 'skillconnect.db'))
+    monkeypatch.setitem(web.app.config, 'TESTING', True)
+    monkeypatch.setattr(web, '_db_pool', None)
+    for cache in (web.user_cache, web.stats_cache, web.chat_response_cache, web.recommendation_cache._lru):
+        cache.clear()
+    web.skill_matcher.invalidate()
+
+    with web.app.app_context():
+        web.init_db()
+    yield web.app
+
+    web.chat_writer.flush()
+    web.view_counter.flush()
+    web.get_db_pool().close_all()
+
+@pytest.fixture
+def db(app):
+    """A pooled connection to the test's database, outside any request"""
+    conn = web.get_db_pool().acquire()
+    yield conn
+    web.get_db_pool().release(conn)
+
+@pytest.fixture
+def student(app):
+    """Test client signed up and logged in as a student"""
+    client = app.test_client()
+    client.post('/signup', data=STUDENT)
+    return client
+
+@pytest.fixture
+def recruiter(app):
+    """Test client logged in as the seeded recruiter"""
+    client = app.test_client()
+    client.post('/login', data={'email': 'recruiter@techstart.com', 'password': 'password123'})
+    return client
@@ -0,0 +1,47 @@
+"""JSON routes reject malformed bodies with a 4xx instead of acting on them"""
+import pytest
+
+SKILLS = {'skills': [{'skill_id': 's1', 'proficiency': 4}, {'skill_id': 's3', 'proficiency': 2}]}
+
+@pytest.mark.parametrize('body', [
+    {'skill_ids': ['s1', 's2']},
+    {'skills': 's1'},
+    {'skills': ['s1']},
+    {'skills': [{'proficiency': 3}]},
+    {'skills': [{'skill_id': {'id': 's1'}}]},
+    ['s1'],
+])
+def test_bad_skills_body_is_rejected_and_keeps_existing_skills(student, body):
+    student.post('/api/profile/skills', json=SKILLS)
+
+    assert student.post('/api/profile/skills', json=body).status_code == 400
+    assert len(student.get('/api/profile/skills').get_json()['skills']) == 2
+
+def test_empty_skills_list_clears_skills(student):
+    student.post('/api/profile/skills', json=SKILLS)
+
+    assert student.post('/api/profile/skills', json={'skills': []}).get_json() == {'skills': []}
+
+def test_withdraw_reports_bad_input_and_missing_applications(student):
+    assert student.post('/api/withdraw', data='internship_id=i1').status_code == 400
+    assert student.post('/api/withdraw', json=['i1']).status_code == 400
+    assert student.post('/api/withdraw', json={}).status_code == 400
+
+    response = student.post('/api/withdraw', json={'internship_id': 'i1'})
+    assert response.status_code == 404
+    assert response.get_json()['success'] is False
+
+    student.post('/api/apply', json={'internship_id': 'i1'})
+    assert student.post('/api/withdraw', json={'internship_id': 'i1'}).get_json() == {'success': True}
+
+@pytest.mark.parametrize('body', [{'bio': {'x': 1}}, {'phone': ['555']}, {'college_name': True}, ['bio']])
+def test_profile_fields_must_be_scalars(student, body):
+    response = student.post('/api/profile', json=body)
+
+    assert response.status_code == 400
+    assert student.get('/api/profile').get_json()['user']['college_name'] == 'Test College'
+
+def test_profile_accepts_strings_numbers_and_null(student):
+    user = student.post('/api/profile', json={'bio': None, 'year': 4, 'phone': '555-0100'}).get_json()['user']
+
+    assert (user['bio'], user['year'], user['phone']) == (None, 4, '555-0100')
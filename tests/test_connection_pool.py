@@ -0,0 +1,62 @@
+"""ConnectionPool caps checked-out connections and get_db_pool() builds one pool per process"""
+import threading
+
+import pytest
+
+import web
+
+def test_acquire_waits_then_raises_when_every_connection_is_checked_out(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'DB_POOL_TIMEOUT', 0.05)
+    pool = web.ConnectionPool(str(tmp_path / 'pool.db'), 1, 2)
+    first, second = pool.acquire(), pool.acquire()
+
+    with pytest.raises(web.DatabaseBusy):
+        pool.acquire()
+
+    pool.release(first)
+    assert pool.acquire() is first
+    for conn in (first, second):
+        pool.release(conn)
+    pool.close_all()
+
+def test_route_returns_503_when_the_pool_is_exhausted(app, student, monkeypatch):
+    monkeypatch.setitem(app.config, 'DB_POOL_TIMEOUT', 0.05)
+    pool = web.get_db_pool()
+    held = []
+    try:
+        while True:
+            held.append(pool.acquire())
+    except web.DatabaseBusy:
+        pass
+    try:
+        assert len(held) == app.config['DB_POOL_MAX_CONNECTIONS']
+        assert student.get('/api/profile').status_code == 503
+    finally:
+        for conn in held:
+            pool.release(conn)
+
+def test_concurrent_first_use_builds_a_single_pool(app, monkeypatch):
+    monkeypatch.setattr(web, '_db_pool', None)
+    created = []
+    init = web.ConnectionPool.__init__
+
+    def counting_init(pool, *args):
+        created.append(pool)
+        init(pool, *args)
+
+    monkeypatch.setattr(web.ConnectionPool, '__init__', counting_init)
+    start = threading.Barrier(8)
+    pools = []
+
+    def first_use():
+        start.wait()
+        pools.append(web.get_db_pool())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
@@ -0,0 +1,50 @@
+"""Writes bump only the data_versions counters whose readers they affect"""
+import web
+
+def versions(db):
+    return dict(db.execute('SELECT name, version FROM data_versions').fetchall())
+
+def test_apply_bumps_applicants_not_internships(db, student):
+    before = versions(db)
+    student.post('/api/apply', json={'internship_id': 'i1'})
+    after = versions(db)
+
+    assert after.get('internships') == before.get('internships')
+    assert after['applicants'] == before.get('applicants', 0) + 1
+
+def test_other_students_apply_keeps_warm_dashboard_stats(app, db, student):
+    student.get('/dashboard')
+    statements = []
+    other = app.test_client()
+    other.post('/signup', data={'name': 'Ravi', 'email': 'ravi@college.edu', 'password': 'password123',
+                                'role': 'STUDENT', 'college_name': 'Test College', 'college_tier': 'TIER_2',
+                                'year': '2'})
+    other.post('/api/apply', json={'internship_id': 'i1'})
+
+    web.get_db_pool().close_all()
+    conn = web.get_db_pool().acquire()
+    conn.set_trace_callback(statements.append)
+    web.get_db_pool().release(conn)
+    response = student.get('/dashboard')
+
+    assert response.status_code == 200
+    assert not any('AS remote' in sql for sql in statements)
+
+def test_listing_etag_changes_with_applicant_counts(student):
+    etag = student.get('/api/internships').headers['ETag']
+    student.post('/api/apply', json={'internship_id': 'i1'})
+
+    assert student.get('/api/internships', headers={'If-None-Match': etag}).status_code == 200
+
+def test_skill_matcher_reloads_when_another_worker_changes_internships(db, student):
+    student.post('/api/profile/skills', json={'skills': [{'skill_id': 's1', 'proficiency': 5}]})
+    user_id = db.execute("SELECT id FROM users WHERE email = 'asha@college.edu'").fetchone()['id']
+    ranked = [internship_id for internship_id, _ in web.recommendation_cache.refresh(db, [user_id])[user_id]]
+    assert 'i1' in ranked
+
+    # Closed by another worker: this process's matcher is never told to invalidate
+    db.execute("UPDATE internships SET status = 'CLOSED' WHERE id = 'i1'")
+    db.commit()
+
+    ranked = [internship_id for internship_id, _ in web.recommendation_cache.refresh(db, [user_id])[user_id]]
+    assert 'i1' not in ranked
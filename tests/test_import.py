@@ -0,0 +1,41 @@
+"""FeedImporter validates internship rows and re-ranks only the students they affect"""
+import web
+
+def posting(internship_id, skills, **fields):
+    row = {'id': internship_id, 'title': 'Data Intern', 'description': 'Pipelines', 'location': 'Remote',
+           'type': 'FULL_TIME', 'duration': '3', 'company_id': 'c1', 'posted_by': 'recruiter@techstart.com',
+           'skills': skills}
+    row.update(fields)
+    return row
+
+def import_internships(db, rows):
+    importer = web.FeedImporter(db, 'internships')
+    return importer, importer.run(enumerate(rows, start=1))
+
+def test_created_at_is_normalized_or_rejected(db):
+    importer, stats = import_internships(db, [
+        posting('n1', 'Python', created_at='2024-03-01T09:30:00+05:30'),
+        posting('n2', 'Python', created_at='2024-03-02'),
+        posting('n3', 'Python', created_at='last tuesday'),
+    ])
+
+    assert (stats['inserted'], stats['invalid']) == (2, 1)
+    assert importer.errors == [(3, 'created_at must be an ISO 8601 timestamp')]
+    stored = dict(db.execute("SELECT id, created_at FROM internships WHERE id IN ('n1', 'n2')").fetchall())
+    assert stored == {'n1': '2024-03-01 04:00:00', 'n2': '2024-03-02 00:00:00'}
+
+def test_import_only_drops_rankings_of_students_sharing_a_skill(db, student):
+    student.post('/api/profile/skills', json={'skills': [{'skill_id': 's1', 'proficiency': 5}]})
+    user_id = db.execute("SELECT id FROM users WHERE email = 'asha@college.edu'").fetchone()['id']
+    db.execute("INSERT INTO users (id, email, password, name, role) VALUES ('u2', 'x@y.z', '', 'X', 'STUDENT')")
+    db.execute("INSERT INTO student_skills (id, user_id, skill_id, proficiency) VALUES ('ss2', 'u2', 's2', 3)")
+    db.commit()
+    web.recommendation_cache.refresh(db, [user_id, 'u2'])
+    skill = db.execute("SELECT name FROM skills WHERE id = 's1'").fetchone()['name']
+
+    import_internships(db, [posting('n1', skill)])
+
+    ranked = {row['user_id'] for row in db.execute('SELECT user_id FROM recommendations')}
+    assert 'u2' in ranked
+    assert user_id not in ranked or 'n1' in db.execute(
+        'SELECT ranking FROM recommendations WHERE user_id = ?', (user_id,)).fetchone()['ranking']
@@ -0,0 +1,121 @@
+"""EXPLAIN QUERY PLAN checks: every statement a route runs must reach its rows through an index"""
+import re
+
+import pytest
+
+import web
+
+# (client, method, path, JSON body) for each route that touches the database
+ROUTES = [
+    ('student', 'GET', '/dashboard', None),
+    ('student', 'GET', '/profile', None),
+    ('student', 'GET', '/api/internships', None),
+    ('student', 'GET', '/api/internships?type=FULL_TIME&location=Remote', None),
+    ('student', 'GET', '/api/internships?search=developer', None),
+    ('student', 'GET', '/api/search?q=python', None),
+    ('student', 'GET', '/api/search?q=python&location=Remote', None),
+    ('student', 'GET', '/api/recommendations', None),
+    ('student', 'GET', '/api/profile', None),
+    ('student', 'POST', '/api/profile', {'bio': 'Likes databases'}),
+    ('student', 'GET', '/api/profile/skills', None),
+    ('student', 'POST', '/api/profile/skills', {'skills': [{'skill_id': 's1', 'proficiency': 4},
+                                                           {'skill_id': 's2', 'proficiency': 2}]}),
+    ('student', 'POST', '/api/apply', {'internship_id': 'i1'}),
+    ('student', 'POST', '/api/apply/bulk', {'internship_ids': ['i2', 'i3']}),
+    ('student', 'POST', '/api/withdraw', {'internship_id': 'i2'}),
+    ('student', 'POST', '/api/chat', {'message': 'How do I apply?'}),
+    ('student', 'GET', '/api/chat/history', None),
+    ('recruiter', 'GET', '/dashboard', None),
+    ('recruiter', 'GET', '/analytics', None),
+    ('recruiter', 'GET', '/api/analytics', None),
+    ('recruiter', 'GET', '/api/applications/export', None),
+    ('recruiter', 'POST', '/api/internships/i2/status', {'status': 'CLOSED'}),
+]
+
+STUDENT_SKILLS = {'skills': [{'skill_id': 's1', 'proficiency': 5}, {'skill_id': 's3', 'proficiency': 3},
+                             {'skill_id': 's5', 'proficiency': 2}]}
+
+SKIPPED_STATEMENTS = ('--', 'PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+@pytest.fixture
+def statements(app, monkeypatch):
+    """SQL run on any pooled connection opened from here on, with parameters inlined"""
+    executed = []
+    connect = web.ConnectionPool._connect
+
+    def traced_connect(pool):
+        conn = connect(pool)
+        conn.set_trace_callback(executed.append)
+        return conn
+
+    # Drop the connection init_db() left idle so every later one is traced
+    web.get_db_pool().close_all()
+    monkeypatch.setattr(web.ConnectionPool, '_connect', traced_connect)
+    return executed
+
+def query_plan(conn, sql):
+    return [row['detail'] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql)]
+
+def unindexed_steps(plan):
+    """Plan steps that read a whole table rather than searching or walking an index
+
+    A bare SCAN of a materialized subquery (the top search hits) is fine, as are
+    scans of virtual tables such as json_each and the FTS index.
+    """
+    materialized = {step.split()[-1] for step in plan if step.startswith('MATERIALIZE ')}
+    return [step for step in plan
+            if re.fullmatch(r'SCAN (\w+)', step) and step.split()[1] not in materialized]
+
+@pytest.mark.parametrize('role, method, path, body', ROUTES)
+def test_route_queries_use_indexes(request, db, statements, role, method, path, body):
+    client = request.getfixturevalue(role)
+    if role == 'student':
+        # Give the student skills so the recommendation and matcher queries run too,
+        # and an application the withdraw route can remove
+        assert client.post('/api/profile/skills', json=STUDENT_SKILLS).get_json()['skills']
+        assert client.post('/api/apply', json={'internship_id': 'i2'}).status_code == 200
+    statements.clear()
+    response = client.open(path, method=method, json=body)
+    web.chat_writer.flush()
+    web.view_counter.flush()
+    assert response.status_code == 200
+
+    checked = 0
+    for sql in dict.fromkeys(sql.strip() for sql in statements):
+        if sql.upper().startswith(SKIPPED_STATEMENTS):
+            continue
+        plan = query_plan(db, sql)
+        assert not unindexed_steps(plan), f'{sql}\n{plan}'
+        checked += 1
+    assert checked
+
+def test_listing_walks_the_partial_index_in_order(db):
+    cursor = db.cursor()
+    statements = []
+    db.set_trace_callback(statements.append)
+    page, next_cursor = web.fetch_internships_page(cursor, limit=2)
+    web.fetch_internships_page(cursor, after=web.decode_cursor(next_cursor), internship_type='FULL_TIME', limit=2)
+    db.set_trace_callback(None)
+
+    listing = [sql for sql in statements if 'FROM internships i' in sql]
+    assert len(listing) == 2
+    for sql in listing:
+        plan = query_plan(db, sql)
+        assert any('USING INDEX idx_internships_active_created' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+
+def test_apply_looks_up_internships_by_id(db):
+    statements = []
+    db.set_trace_callback(statements.append)
+    web.apply_to_internships(db, 'u1', ['i1', 'i2'], None)
+    db.set_trace_callback(None)
+
+    insert = next(sql for sql in statements if sql.lstrip().startswith('INSERT INTO applications'))
+    plan = query_plan(db, insert)
+    assert 'SEARCH i USING INDEX sqlite_autoindex_internships_1 (id=?)' in plan, plan
+
+def test_migrations_leave_only_partial_status_indexes(db):
+    indexes = {row['name'] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_internships_active_created', 'idx_internships_active_location',
+            'idx_internships_active_company'} <= indexes
+    assert 'idx_internships_status_created' not in indexes
@@ -0,0 +1,34 @@
+"""Recruiter analytics rollups stay equal to a full recomputation"""
+import web
+
+def test_rollups_follow_apply_withdraw_status_and_tier_changes(db, student, recruiter):
+    assert student.post('/api/apply/bulk', json={'internship_ids': ['i1', 'i2', 'i3']}).status_code == 200
+    assert student.post('/api/withdraw', json={'internship_id': 'i2'}).status_code == 200
+    db.execute("UPDATE applications SET status = 'ACCEPTED' WHERE internship_id = 'i1'")
+    db.execute("UPDATE applications SET applied_at = date('now', '-3 days') WHERE internship_id = 'i3'")
+    db.commit()
+    assert student.post('/api/profile', json={'college_tier': 'TIER_2'}).status_code == 200
+
+    assert web.check_rollups(db) == {'internship_daily_stats': 0, 'application_segment_rollups': 0}
+
+    analytics = recruiter.get('/api/analytics').get_json()
+    assert analytics['tiers'] == {'TIER_2': 2}
+    assert analytics['statuses'] == {'ACCEPTED': 1, 'PENDING': 1}
+
+def test_check_rollups_reports_drift_and_rebuild_repairs_it(db, student):
+    student.post('/api/apply', json={'internship_id': 'i1'})
+    db.execute("UPDATE application_segment_rollups SET applications = applications + 1")
+    db.commit()
+    assert web.check_rollups(db)['application_segment_rollups'] > 0
+
+    web.rebuild_rollups(db)
+    assert web.check_rollups(db) == {'internship_daily_stats': 0, 'application_segment_rollups': 0}
+
+def test_analytics_page_renders_when_application_counts_drift(db, student, recruiter):
+    student.post('/api/apply', json={'internship_id': 'i1'})
+    db.execute('UPDATE internships SET application_count = 0')
+    db.commit()
+
+    response = recruiter.get('/analytics')
+    assert response.status_code == 200
+    assert b'width: 100.0%' in response.data
@@ -10,9 +10,37 @@ import hashlib
 import secrets
 import json
 import re
-from datetime import datetime
-from functools import wraps
-from flask import Flask, render_template_string, request, jsonify, session, redirect, url_for, flash
+import html
+import queue
+import base64
+import atexit
+import os
+import threading
+import time
+import hmac
+import random
+import csv
+import io
+import statistics
+import tempfile
+import mimetypes
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from itertools import islice
+import zlib
+import click
+import numpy as np
+from jinja2 import DictLoader
+from flask import (Flask, Response, render_template, request, jsonify, session, redirect, url_for, flash, g,
+                   has_request_context, make_response, send_from_directory, stream_with_context)
+from werkzeug.utils import safe_join
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-in-production'
@@ -22,33 +50,333 @@ app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HT
 # DATABASE SETUP
 # =============================================================================
 
+app.config['DATABASE'] = 'skillconnect.db'
+app.config['DB_POOL_SIZE'] = 8
+# Connections checked out at once; further acquirers wait up to DB_POOL_TIMEOUT seconds
+app.config['DB_POOL_MAX_CONNECTIONS'] = 32
+app.config['DB_POOL_TIMEOUT'] = 10.0
+app.config['DB_BUSY_TIMEOUT_MS'] = 5000
+app.config['DB_MMAP_SIZE'] = 256 * 1024 * 1024
+app.config['DB_CACHE_SIZE_KB'] = 16 * 1024
+
+class DatabaseBusy(Exception):
+    """Raised when no pooled connection frees up within DB_POOL_TIMEOUT seconds"""
+
+class ConnectionPool:
+    """Bounded pool of configured SQLite connections, shared by request threads
+
+    At most `size` idle connections are kept, and at most `max_connections` may be
+    checked out at once.
+    """
+
+    def __init__(self, database, size, max_connections):
+        self.database = database
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._checked_out = threading.BoundedSemaphore(max_connections)
+
+    def _connect(self):
+        """Open a connection and apply the per-connection pragmas once"""
+        conn = sqlite3.connect(self.database, check_same_thread=False,
+                               timeout=app.config['DB_BUSY_TIMEOUT_MS'] / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f"PRAGMA busy_timeout = {int(app.config['DB_BUSY_TIMEOUT_MS'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(app.config['DB_MMAP_SIZE'])}")
+        conn.execute(f"PRAGMA cache_size = -{int(app.config['DB_CACHE_SIZE_KB'])}")
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+
+    def acquire(self):
+        """Reuse an idle connection or open a new one, waiting while too many are checked out"""
+        if not self._checked_out.acquire(timeout=app.config['DB_POOL_TIMEOUT']):
+            raise DatabaseBusy()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._checked_out.release()
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        finally:
+            self._checked_out.release()
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """Return the process-wide pool, created lazily so forked workers get their own
+
+    Pending schema migrations are applied the first time the pool is created.
+    """
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                pool = ConnectionPool(app.config['DATABASE'], app.config['DB_POOL_SIZE'],
+                                      app.config['DB_POOL_MAX_CONNECTIONS'])
+                conn = pool.acquire()
+                try:
+                    migrate_db(conn)
+                finally:
+                    pool.release(conn)
+                _db_pool = pool
+    return _db_pool
+
 def get_db_connection():
-    """Create a database connection"""
-    conn = sqlite3.connect('skillconnect.db', check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return the connection bound to the current app context"""
+    if 'db' not in g:
+        g.db = get_db_pool().acquire()
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Hand the request's connection back to the pool"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_db_pool().release(conn)
+
+@app.errorhandler(DatabaseBusy)
+def database_busy(error):
+    """Ask the client to retry when every pooled connection stayed checked out"""
+    return jsonify({'error': 'The server is busy right now, please try again'}), 503
 
-def init_db():
-    """Initialize the database with all tables and seed data"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+# =============================================================================
+# SCHEMA MIGRATIONS
+# =============================================================================
 
-    # Drop tables if they exist (for clean start)
-    cursor.executescript('''
-        DROP TABLE IF EXISTS chat_messages;
-        DROP TABLE IF EXISTS saved_internships;
-        DROP TABLE IF EXISTS applications;
-        DROP TABLE IF EXISTS internship_skills;
-        DROP TABLE IF EXISTS internships;
-        DROP TABLE IF EXISTS student_skills;
-        DROP TABLE IF EXISTS skills;
-        DROP TABLE IF EXISTS companies;
-        DROP TABLE IF EXISTS users;
+# internships_fts holds only ACTIVE internships, so ranking never has to join
+# back to filter on status. Each document carries its internship id (searches
+# join on it) under a docid from internship_search_docs, which VACUUM never
+# renumbers, so triggers can replace one internship's document by key.
+FTS_DOCUMENT_SELECT = '''
+        SELECT d.docid, i.id, i.title, i.description, COALESCE(c.name, ''),
+               COALESCE((SELECT group_concat(s.name, ' ')
+                         FROM internship_skills isk JOIN skills s ON s.id = isk.skill_id
+                         WHERE isk.internship_id = i.id), '')
+        FROM internships i
+        JOIN internship_search_docs d ON d.internship_id = i.id
+        LEFT JOIN companies c ON c.id = i.company_id
+        WHERE i.status = 'ACTIVE'
+'''
+FTS_INSERT = 'INSERT INTO internships_fts (rowid, internship_id, title, description, company_name, skills)'
+FTS_TRIGGERS = ('internships_fts_insert', 'internships_fts_update', 'internship_skills_fts_insert',
+                'internship_skills_fts_delete', 'companies_fts_update', 'skills_fts_update',
+                'internships_fts_delete')
+
+def fts_assign_docids(where):
+    """Statement giving every active internship matching where a search docid if it has none yet"""
+    return f'''
+        INSERT OR IGNORE INTO internship_search_docs (internship_id)
+        SELECT i.id FROM internships i WHERE i.status = 'ACTIVE' AND {where}
+    '''
+
+def fts_sync_triggers(names=None):
+    """Triggers that re-index an internship's search row whenever one of its sources changes
+
+    Pass names to get only those triggers' statements.
+    """
+    def refresh(where):
+        return f'''
+            DELETE FROM internships_fts WHERE rowid IN (
+                SELECT d.docid FROM internships i JOIN internship_search_docs d ON d.internship_id = i.id
+                WHERE {where}
+            );
+            {fts_assign_docids(where)};
+            {FTS_INSERT} {FTS_DOCUMENT_SELECT} AND {where};
+        '''
+
+    sources = [
+        ('internships_fts_insert', 'AFTER INSERT ON internships', 'i.id = NEW.id'),
+        ('internships_fts_update', 'AFTER UPDATE OF title, description, company_id, status ON internships', 'i.id = NEW.id'),
+        ('internship_skills_fts_insert', 'AFTER INSERT ON internship_skills', 'i.id = NEW.internship_id'),
+        ('internship_skills_fts_delete', 'AFTER DELETE ON internship_skills', 'i.id = OLD.internship_id'),
+        ('companies_fts_update', 'AFTER UPDATE OF name ON companies', 'i.company_id = NEW.id'),
+        ('skills_fts_update', 'AFTER UPDATE OF name ON skills',
+         'i.id IN (SELECT internship_id FROM internship_skills WHERE skill_id = NEW.id)'),
+    ]
+    triggers = [(name, f'CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {refresh(where)} END')
+                for name, event, where in sources]
+    triggers.append(('internships_fts_delete', '''
+        CREATE TRIGGER IF NOT EXISTS internships_fts_delete AFTER DELETE ON internships
+        BEGIN
+            DELETE FROM internships_fts
+            WHERE rowid = (SELECT docid FROM internship_search_docs WHERE internship_id = OLD.id);
+            DELETE FROM internship_search_docs WHERE internship_id = OLD.id;
+        END
+    '''))
+    return [statement for name, statement in triggers if names is None or name in names]
+
+# The search index as migration 4 released it, keyed by internships.rowid, which VACUUM
+# may renumber. Kept verbatim so that migration runs the same everywhere; migration 12
+# drops it in favour of the docid-keyed index above.
+FTS_V1_DOCUMENT_SELECT = '''
+        SELECT i.rowid, i.title, i.description, COALESCE(c.name, ''),
+               COALESCE((SELECT group_concat(s.name, ' ')
+                         FROM internship_skills isk JOIN skills s ON s.id = isk.skill_id
+                         WHERE isk.internship_id = i.id), '')
+        FROM internships i
+        LEFT JOIN companies c ON c.id = i.company_id
+        WHERE i.status = 'ACTIVE'
+'''
+
+def fts_v1_sync_triggers():
+    """Migration 4's rowid-keyed search triggers"""
+    def refresh(where):
+        return f'''
+            DELETE FROM internships_fts WHERE rowid IN (SELECT i.rowid FROM internships i WHERE {where});
+            INSERT INTO internships_fts (rowid, title, description, company_name, skills)
+            {FTS_V1_DOCUMENT_SELECT} AND {where};
+        '''
+
+    sources = [
+        ('internships_fts_insert', 'AFTER INSERT ON internships', 'i.id = NEW.id'),
+        ('internships_fts_update', 'AFTER UPDATE OF title, description, company_id, status ON internships', 'i.id = NEW.id'),
+        ('internship_skills_fts_insert', 'AFTER INSERT ON internship_skills', 'i.id = NEW.internship_id'),
+        ('internship_skills_fts_delete', 'AFTER DELETE ON internship_skills', 'i.id = OLD.internship_id'),
+        ('companies_fts_update', 'AFTER UPDATE OF name ON companies', 'i.company_id = NEW.id'),
+        ('skills_fts_update', 'AFTER UPDATE OF name ON skills',
+         'i.id IN (SELECT internship_id FROM internship_skills WHERE skill_id = NEW.id)'),
+    ]
+    triggers = [f'CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {refresh(where)} END'
+                for name, event, where in sources]
+    triggers.append('''
+        CREATE TRIGGER IF NOT EXISTS internships_fts_delete AFTER DELETE ON internships
+        BEGIN
+            DELETE FROM internships_fts WHERE rowid = OLD.rowid;
+        END
     ''')
+    return triggers
 
-    # Create users table
-    cursor.execute('''
-        CREATE TABLE users (
+def rebuild_search_index(conn):
+    """Rebuild internships_fts from scratch, returning the number of indexed internships"""
+    conn.execute('DELETE FROM internships_fts')
+    conn.execute(fts_assign_docids('1'))
+    cursor = conn.execute(FTS_INSERT + FTS_DOCUMENT_SELECT)
+    conn.commit()
+    return cursor.rowcount
+
+def bump_data_version(name_sql):
+    """Statement incrementing the data_versions counter whose name the SQL expression yields"""
+    return f'''
+        INSERT INTO data_versions (name, version, updated_at) VALUES ({name_sql}, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;
+    '''
+
+def data_version_triggers(names=None):
+    """Triggers bumping the 'internships', 'applicants' and per-user 'user:<id>' counters behind conditional GETs
+
+    Pass names to get only those triggers' statements.
+    """
+    listing = bump_data_version("'internships'")
+    sources = [
+        ('internships_version_insert', 'AFTER INSERT ON internships', listing),
+        ('internships_version_delete', 'AFTER DELETE ON internships', listing),
+        # views is deliberately left out: every listing bumps it. Applicant counts move with
+        # every apply, so they get their own counter rather than invalidating everything keyed
+        # on 'internships' (dashboard stats, recommendations)
+        ('internships_version_update', '''AFTER UPDATE OF title, description, location, type, duration, stipend,
+            posted_by_id, company_id, status, created_at ON internships''', listing),
+        ('internships_applicants_version_update', 'AFTER UPDATE OF application_count ON internships',
+         bump_data_version("'applicants'")),
+        ('internship_skills_version_insert', 'AFTER INSERT ON internship_skills', listing),
+        ('internship_skills_version_delete', 'AFTER DELETE ON internship_skills', listing),
+        ('companies_version_update', 'AFTER UPDATE OF name ON companies', listing),
+        ('skills_version_update', 'AFTER UPDATE OF name, category ON skills', listing),
+        ('users_version_update', '''AFTER UPDATE OF email, name, role, phone, college_tier, college_name, year, bio
+            ON users''', bump_data_version("'user:' || NEW.id")),
+        ('applications_version_insert', 'AFTER INSERT ON applications', bump_data_version("'user:' || NEW.user_id")),
+        ('applications_version_delete', 'AFTER DELETE ON applications', bump_data_version("'user:' || OLD.user_id")),
+        ('applications_version_update', 'AFTER UPDATE OF status ON applications',
+         bump_data_version("'user:' || NEW.user_id")),
+        ('student_skills_version_insert', 'AFTER INSERT ON student_skills', bump_data_version("'user:' || NEW.user_id")),
+        ('student_skills_version_delete', 'AFTER DELETE ON student_skills', bump_data_version("'user:' || OLD.user_id")),
+        ('student_skills_version_update', 'AFTER UPDATE ON student_skills', bump_data_version("'user:' || NEW.user_id")),
+    ]
+    return [f'CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END'
+            for name, event, body in sources if names is None or name in names]
+
+# Full recomputations of the application rollups; the triggers below keep the
+# tables equal to these without rescanning applications
+ROLLUP_DAILY_SELECT = '''
+    SELECT internship_id, date(applied_at) AS day, COUNT(*) AS applications
+    FROM applications
+    GROUP BY internship_id, day
+'''
+ROLLUP_SEGMENT_SELECT = '''
+    SELECT a.internship_id, IFNULL(u.college_tier, 'UNKNOWN') AS college_tier,
+           IFNULL(a.status, 'PENDING') AS status, COUNT(*) AS applications
+    FROM applications a
+    LEFT JOIN users u ON u.id = a.user_id
+    GROUP BY a.internship_id, college_tier, status
+'''
+
+def rollup_delta(row, sign):
+    """Statements adding one application row (NEW or OLD) to the rollups, or removing it when sign is -1"""
+    return f'''
+        INSERT INTO internship_daily_stats (internship_id, day, applications)
+        VALUES ({row}.internship_id, date({row}.applied_at), {sign})
+        ON CONFLICT(internship_id, day) DO UPDATE SET applications = applications + excluded.applications;
+        INSERT INTO application_segment_rollups (internship_id, college_tier, status, applications)
+        VALUES ({row}.internship_id, IFNULL((SELECT college_tier FROM users WHERE id = {row}.user_id), 'UNKNOWN'),
+                IFNULL({row}.status, 'PENDING'), {sign})
+        ON CONFLICT(internship_id, college_tier, status) DO UPDATE
+        SET applications = applications + excluded.applications;
+    '''
+
+def rollup_triggers():
+    """Triggers keeping the per-day and per-tier/status application rollups in step with applications"""
+    tier_change = '''
+        INSERT INTO application_segment_rollups (internship_id, college_tier, status, applications)
+        SELECT internship_id, tier, status, delta FROM (
+            SELECT internship_id, IFNULL(OLD.college_tier, 'UNKNOWN') AS tier, IFNULL(status, 'PENDING') AS status,
+                   -COUNT(*) AS delta
+            FROM applications WHERE user_id = OLD.id GROUP BY internship_id, status
+            UNION ALL
+            SELECT internship_id, IFNULL(NEW.college_tier, 'UNKNOWN'), IFNULL(status, 'PENDING'), COUNT(*)
+            FROM applications WHERE user_id = NEW.id GROUP BY internship_id, status
+        ) WHERE true
+        ON CONFLICT(internship_id, college_tier, status) DO UPDATE
+        SET applications = applications + excluded.applications;
+    '''
+    sources = [
+        ('applications_rollup_insert', 'AFTER INSERT ON applications', rollup_delta('NEW', 1)),
+        ('applications_rollup_delete', 'AFTER DELETE ON applications', rollup_delta('OLD', -1)),
+        ('applications_rollup_update', 'AFTER UPDATE OF internship_id, user_id, status, applied_at ON applications',
+         rollup_delta('OLD', -1) + rollup_delta('NEW', 1)),
+        ('users_rollup_tier', 'AFTER UPDATE OF college_tier ON users WHEN OLD.college_tier IS NOT NEW.college_tier',
+         tier_change),
+    ]
+    return [f'CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END' for name, event, body in sources]
+
+# Each entry is one schema version, applied in order and recorded in PRAGMA
+# user_version. Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    # 1: base schema
+    [
+        # Create users table
+        '''
+        CREATE TABLE IF NOT EXISTS users (
             id TEXT PRIMARY KEY,
             email TEXT UNIQUE NOT NULL,
             password TEXT NOT NULL,
@@ -61,11 +389,10 @@ def init_db():
             bio TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
-
-    # Create companies table
-    cursor.execute('''
-        CREATE TABLE companies (
+        ''',
+        # Create companies table
+        '''
+        CREATE TABLE IF NOT EXISTS companies (
             id TEXT PRIMARY KEY,
             name TEXT NOT NULL,
             description TEXT,
@@ -75,21 +402,19 @@ def init_db():
             logo TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
-
-    # Create skills table
-    cursor.execute('''
-        CREATE TABLE skills (
+        ''',
+        # Create skills table
+        '''
+        CREATE TABLE IF NOT EXISTS skills (
             id TEXT PRIMARY KEY,
             name TEXT UNIQUE NOT NULL,
             category TEXT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
-    ''')
-
-    # Create internships table
-    cursor.execute('''
-        CREATE TABLE internships (
+        ''',
+        # Create internships table
+        '''
+        CREATE TABLE IF NOT EXISTS internships (
             id TEXT PRIMARY KEY,
             title TEXT NOT NULL,
             description TEXT NOT NULL,
@@ -105,11 +430,10 @@ def init_db():
             FOREIGN KEY (posted_by_id) REFERENCES users(id),
             FOREIGN KEY (company_id) REFERENCES companies(id)
         )
-    ''')
-
-    # Create internship_skills table (many-to-many)
-    cursor.execute('''
-        CREATE TABLE internship_skills (
+        ''',
+        # Create internship_skills table (many-to-many)
+        '''
+        CREATE TABLE IF NOT EXISTS internship_skills (
             id TEXT PRIMARY KEY,
             internship_id TEXT NOT NULL,
             skill_id TEXT NOT NULL,
@@ -118,11 +442,10 @@ def init_db():
             FOREIGN KEY (skill_id) REFERENCES skills(id),
             UNIQUE(internship_id, skill_id)
         )
-    ''')
-
-    # Create applications table
-    cursor.execute('''
-        CREATE TABLE applications (
+        ''',
+        # Create applications table
+        '''
+        CREATE TABLE IF NOT EXISTS applications (
             id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             internship_id TEXT NOT NULL,
@@ -134,11 +457,10 @@ def init_db():
             FOREIGN KEY (internship_id) REFERENCES internships(id),
             UNIQUE(user_id, internship_id)
         )
-    ''')
-
-    # Create student_skills table (many-to-many)
-    cursor.execute('''
-        CREATE TABLE student_skills (
+        ''',
+        # Create student_skills table (many-to-many)
+        '''
+        CREATE TABLE IF NOT EXISTS student_skills (
             id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             skill_id TEXT NOT NULL,
@@ -148,11 +470,10 @@ def init_db():
             FOREIGN KEY (skill_id) REFERENCES skills(id),
             UNIQUE(user_id, skill_id)
         )
-    ''')
-
-    # Create saved_internships table
-    cursor.execute('''
-        CREATE TABLE saved_internships (
+        ''',
+        # Create saved_internships table
+        '''
+        CREATE TABLE IF NOT EXISTS saved_internships (
             id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             internship_id TEXT NOT NULL,
@@ -161,11 +482,10 @@ def init_db():
             FOREIGN KEY (internship_id) REFERENCES internships(id),
             UNIQUE(user_id, internship_id)
         )
-    ''')
-
-    # Create chat_messages table
-    cursor.execute('''
-        CREATE TABLE chat_messages (
+        ''',
+        # Create chat_messages table
+        '''
+        CREATE TABLE IF NOT EXISTS chat_messages (
             id TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
             message TEXT NOT NULL,
@@ -174,7 +494,220 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id)
         )
+        ''',
+    ],
+    # 2: indexes for the hot route queries
+    [
+        # Dashboard and /api/internships listing (newest active first)
+        '''
+        CREATE INDEX IF NOT EXISTS idx_internships_active_created
+        ON internships (created_at DESC, id DESC) WHERE status = 'ACTIVE'
+        ''',
+        # Applicant counts per internship
+        '''
+        CREATE INDEX IF NOT EXISTS idx_applications_internship
+        ON applications (internship_id)
+        ''',
+        # Profile application history
+        '''
+        CREATE INDEX IF NOT EXISTS idx_applications_user_applied
+        ON applications (user_id, applied_at)
+        ''',
+        # Reverse skill lookups (internship_id lookups use the UNIQUE index)
+        '''
+        CREATE INDEX IF NOT EXISTS idx_internship_skills_skill
+        ON internship_skills (skill_id)
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_student_skills_skill
+        ON student_skills (skill_id)
+        ''',
+        # Chat history per user
+        '''
+        CREATE INDEX IF NOT EXISTS idx_chat_messages_user_created
+        ON chat_messages (user_id, created_at)
+        ''',
+    ],
+    # 3: denormalized applicant count, kept in step with applications by triggers
+    [
+        'ALTER TABLE internships ADD COLUMN application_count INTEGER NOT NULL DEFAULT 0',
+        '''
+        UPDATE internships SET application_count =
+            (SELECT COUNT(*) FROM applications a WHERE a.internship_id = internships.id)
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS applications_count_insert AFTER INSERT ON applications
+        BEGIN
+            UPDATE internships SET application_count = application_count + 1 WHERE id = NEW.internship_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS applications_count_delete AFTER DELETE ON applications
+        BEGIN
+            UPDATE internships SET application_count = application_count - 1 WHERE id = OLD.internship_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS applications_count_move AFTER UPDATE OF internship_id ON applications
+        BEGIN
+            UPDATE internships SET application_count = application_count - 1 WHERE id = OLD.internship_id;
+            UPDATE internships SET application_count = application_count + 1 WHERE id = NEW.internship_id;
+        END
+        ''',
+    ],
+    # 4: full-text search over title, description, company name and skill names
+    [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+            title, description, company_name, skills,
+            tokenize = 'porter unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        ''',
+        '''
+        INSERT INTO internships_fts (rowid, title, description, company_name, skills)
+        ''' + FTS_V1_DOCUMENT_SELECT,
+        *fts_v1_sync_triggers(),
+    ],
+    # 5: persisted per-student recommendation rankings
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS recommendations (
+            user_id TEXT PRIMARY KEY,
+            ranking TEXT NOT NULL,
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+    ],
+    # 6: chat history is paged by (created_at, id) per user
+    [
+        'DROP INDEX IF EXISTS idx_chat_messages_user_created',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_chat_messages_user_created
+        ON chat_messages (user_id, created_at, id)
+        ''',
+    ],
+    # 7: recruiter-scoped queries start from the postings a user owns
+    [
+        'CREATE INDEX IF NOT EXISTS idx_internships_posted_by ON internships (posted_by_id, id)',
+    ],
+    # 8: change counters for ETag/Last-Modified validation
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        ) WITHOUT ROWID
+        ''',
+        *data_version_triggers(),
+    ],
+    # 9: client-supplied keys make apply retries safe to replay
+    [
+        'ALTER TABLE applications ADD COLUMN idempotency_key TEXT',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_user_idempotency
+        ON applications (user_id, idempotency_key) WHERE idempotency_key IS NOT NULL
+        ''',
+    ],
+    # 10: recruiter analytics rollups; views per day are counted from here on
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS internship_daily_stats (
+            internship_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            applications INTEGER NOT NULL DEFAULT 0,
+            views INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (internship_id, day)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS application_segment_rollups (
+            internship_id TEXT NOT NULL,
+            college_tier TEXT NOT NULL,
+            status TEXT NOT NULL,
+            applications INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (internship_id, college_tier, status)
+        ) WITHOUT ROWID
+        ''',
+        'INSERT INTO internship_daily_stats (internship_id, day, applications) ' + ROLLUP_DAILY_SELECT,
+        'INSERT INTO application_segment_rollups (internship_id, college_tier, status, applications) '
+        + ROLLUP_SEGMENT_SELECT,
+        *rollup_triggers(),
+    ],
+    # 11: dashboard counts over active postings
+    [
+        "CREATE INDEX IF NOT EXISTS idx_internships_active_location ON internships (location) WHERE status = 'ACTIVE'",
+        "CREATE INDEX IF NOT EXISTS idx_internships_active_company ON internships (company_id) WHERE status = 'ACTIVE'",
+    ],
+    # 12: search documents carry the internship id under a docid that survives VACUUM
+    [
+        *(f'DROP TRIGGER IF EXISTS {name}' for name in FTS_TRIGGERS),
+        'DROP TABLE IF EXISTS internships_fts',
+        # Rows are removed by internships_fts_delete rather than a foreign key
+        '''
+        CREATE TABLE IF NOT EXISTS internship_search_docs (
+            docid INTEGER PRIMARY KEY,
+            internship_id TEXT NOT NULL UNIQUE
+        )
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+            internship_id UNINDEXED, title, description, company_name, skills,
+            tokenize = 'porter unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        ''',
+        fts_assign_docids('1'),
+        FTS_INSERT + FTS_DOCUMENT_SELECT,
+        *fts_sync_triggers(),
+    ],
+    # 13: applicant count changes bump 'applicants' instead of 'internships'
+    [
+        'DROP TRIGGER IF EXISTS internships_version_update',
+        *data_version_triggers(['internships_version_update', 'internships_applicants_version_update']),
+    ],
+]
+
+def migrate_db(conn):
+    """Apply every migration newer than the database's recorded schema version"""
+    # IMMEDIATE takes the write lock up front so concurrent workers migrate once
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {number}')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def repair_application_counts(conn):
+    """Recompute internships.application_count where it drifted, returning the number of rows fixed"""
+    cursor = conn.execute('''
+        UPDATE internships SET application_count = counted.total
+        FROM (
+            SELECT i.id, COUNT(a.id) AS total
+            FROM internships i
+            LEFT JOIN applications a ON a.internship_id = i.id
+            GROUP BY i.id
+        ) AS counted
+        WHERE internships.id = counted.id AND internships.application_count != counted.total
     ''')
+    conn.commit()
+    return cursor.rowcount
+
+def init_db():
+    """Bring the schema up to date and seed demo data into an empty database"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT 1 FROM users LIMIT 1')
+    if cursor.fetchone():
+        return
 
     # Seed data
     # Create companies
@@ -240,16 +773,1365 @@ def init_db():
     cursor.executemany('INSERT INTO internship_skills (id, internship_id, skill_id) VALUES (?, ?, ?)', internship_skills)
 
     conn.commit()
-    conn.close()
+
+# =============================================================================
+# PASSWORD HASHING
+# =============================================================================
+
+# scrypt cost: memory per hash is 128 * N * r bytes (16 MiB at the defaults)
+app.config['PASSWORD_SCRYPT_N'] = 2 ** 14
+app.config['PASSWORD_SCRYPT_R'] = 8
+app.config['PASSWORD_SCRYPT_P'] = 1
+# Concurrent hashes per worker process, and how many more may wait for a thread
+app.config['PASSWORD_HASH_THREADS'] = 2
+app.config['PASSWORD_HASH_BACKLOG'] = 16
+app.config['PASSWORD_HASH_TIMEOUT'] = 10
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p)
 
 def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password with scrypt as 'scrypt$n$r$p$salt$hash' using the configured cost"""
+    n, r, p = (app.config['PASSWORD_SCRYPT_N'], app.config['PASSWORD_SCRYPT_R'],
+               app.config['PASSWORD_SCRYPT_P'])
+    salt = secrets.token_bytes(16)
+    return f'scrypt${n}${r}${p}${salt.hex()}${_scrypt(password, salt, n, r, p).hex()}'
+
+def verify_password(password, stored):
+    """Check password against a stored hash, returning (matches, needs_rehash)
+
+    Legacy unsalted SHA-256 hashes are still accepted but always need a rehash,
+    as do scrypt hashes made with a cost other than the configured one.
+    """
+    if not stored.startswith('scrypt$'):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored), True
+
+    _, n, r, p, salt, expected = stored.split('$')
+    n, r, p = int(n), int(r), int(p)
+    matches = hmac.compare_digest(_scrypt(password, bytes.fromhex(salt), n, r, p).hex(), expected)
+    current = (app.config['PASSWORD_SCRYPT_N'], app.config['PASSWORD_SCRYPT_R'],
+               app.config['PASSWORD_SCRYPT_P'])
+    return matches, (n, r, p) != current
+
+class HasherBusy(Exception):
+    """Raised when the password hashing backlog is full"""
+
+class PasswordHasher:
+    """Bounded thread pool for password hashing and verification
+
+    scrypt releases the GIL, so running it on PASSWORD_HASH_THREADS threads caps
+    the CPU a login burst can take from other requests. At most
+    PASSWORD_HASH_BACKLOG further jobs may wait; beyond that callers get
+    HasherBusy immediately instead of tying up their request thread, as do
+    callers whose job is not done within PASSWORD_HASH_TIMEOUT seconds.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Created lazily (and again after a fork) since executor threads do not survive fork()
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threads = app.config['PASSWORD_HASH_THREADS']
+                self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='password-hash')
+                self._slots = threading.BoundedSemaphore(threads + app.config['PASSWORD_HASH_BACKLOG'])
+
+    def run(self, fn, *args):
+        """Run fn(*args) on the pool and wait for its result"""
+        self._ensure_started()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=app.config['PASSWORD_HASH_TIMEOUT'])
+        except TimeoutError:
+            # Still queued jobs are dropped; one already running finishes and frees its slot
+            future.cancel()
+            raise HasherBusy() from None
+
+    def hash(self, password):
+        return self.run(hash_password, password)
+
+    def verify(self, password, stored):
+        return self.run(verify_password, password, stored)
+
+password_hasher = PasswordHasher()
 
 def generate_id():
     """Generate unique ID"""
     return secrets.token_hex(16)
 
+def attach_skills(cursor, internships):
+    """Fetch skills for all given internships in one query and attach them as a 'skills' list"""
+    by_id = {internship['id']: internship for internship in internships}
+    for internship in internships:
+        internship['skills'] = []
+
+    # Pass the ids as a single JSON array so the statement count stays constant
+    cursor.execute('''
+        SELECT isk.internship_id, s.* FROM internship_skills isk
+        INNER JOIN skills s ON s.id = isk.skill_id
+        WHERE isk.internship_id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(list(by_id)),))
+    for row in cursor.fetchall():
+        skill = dict(row)
+        by_id[skill.pop('internship_id')]['skills'].append(skill)
+
+# =============================================================================
+# CACHING
+# =============================================================================
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with an optional per-entry TTL and hit/miss counters"""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """Drop one entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+# =============================================================================
+# VIEW TRACKING
+# =============================================================================
+
+app.config['VIEW_FLUSH_INTERVAL'] = 5.0
+app.config['VIEW_FLUSH_THRESHOLD'] = 1000
+
+class ViewCounter:
+    """Write-behind internship view counter
+
+    Increments are aggregated in memory and written in one batched transaction
+    by a background thread, either every VIEW_FLUSH_INTERVAL seconds or as soon
+    as VIEW_FLUSH_THRESHOLD distinct internships are pending, and on shutdown.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+
+    def record(self, internship_ids):
+        """Buffer one view for each internship id"""
+        with self._lock:
+            self._ensure_started()
+            self._counts.update(internship_ids)
+            pending = len(self._counts)
+        if pending >= app.config['VIEW_FLUSH_THRESHOLD']:
+            self._wake.set()
+
+    def _ensure_started(self):
+        # Started lazily (and restarted after a fork) so every worker flushes its own buffer
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='view-counter', daemon=True).start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(app.config['VIEW_FLUSH_INTERVAL'])
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                app.logger.warning('View counter flush failed: %s', e)
+
+    def flush(self):
+        """Write all buffered increments in a single transaction"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+
+        pool = get_db_pool()
+        conn = pool.acquire()
+        try:
+            with conn:
+                conn.executemany('UPDATE internships SET views = views + ? WHERE id = ?',
+                                 [(count, internship_id) for internship_id, count in counts.items()])
+                conn.executemany('''
+                    INSERT INTO internship_daily_stats (internship_id, day, views) VALUES (?, date('now'), ?)
+                    ON CONFLICT(internship_id, day) DO UPDATE SET views = views + excluded.views
+                ''', counts.items())
+        except sqlite3.Error:
+            # Keep the increments for the next attempt
+            with self._lock:
+                self._counts.update(counts)
+            raise
+        finally:
+            pool.release(conn)
+
+view_counter = ViewCounter()
+
+# =============================================================================
+# CHAT PERSISTENCE
+# =============================================================================
+
+app.config['CHAT_WRITE_INTERVAL'] = 0.005
+app.config['CHAT_WRITE_QUEUE_SIZE'] = 10000
+app.config['CHAT_WRITE_TIMEOUT'] = 1.0
+# Retries of a batch after a transient error (e.g. database locked), CHAT_WRITE_TIMEOUT apart
+app.config['CHAT_WRITE_RETRIES'] = 3
+
+class ChatBacklogFull(Exception):
+    """Raised when the chat write queue stays full for CHAT_WRITE_TIMEOUT seconds"""
+
+def chat_timestamp():
+    """Return the current UTC time in CURRENT_TIMESTAMP format with microseconds, for ordering"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+class ChatWriter:
+    """Group-commit writer for chat_messages
+
+    Requests enqueue their rows and return immediately; a background thread
+    collects everything queued within CHAT_WRITE_INTERVAL seconds and inserts
+    it in a single transaction. The queue is bounded: when the writer falls
+    behind, submit() blocks for up to CHAT_WRITE_TIMEOUT seconds and then
+    raises ChatBacklogFull. flush() waits for the queue to drain and runs at
+    shutdown, while the daemon writer thread is still alive.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(app.config['CHAT_WRITE_QUEUE_SIZE'])
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def submit(self, rows):
+        """Queue (id, user_id, message, is_user, created_at) rows to be written together"""
+        with self._lock:
+            self._ensure_started()
+        try:
+            self._queue.put(rows, timeout=app.config['CHAT_WRITE_TIMEOUT'])
+        except queue.Full:
+            raise ChatBacklogFull() from None
+
+    def flush(self, timeout=10):
+        """Block until everything queued so far has been committed"""
+        if self._pid != os.getpid():
+            return True
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def _ensure_started(self):
+        # Started lazily (and restarted after a fork) so every worker drains its own queue
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='chat-writer', daemon=True).start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Give concurrent requests a moment to join this transaction
+            time.sleep(app.config['CHAT_WRITE_INTERVAL'])
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            submissions = [item for item in batch if not isinstance(item, threading.Event)]
+            rows = [row for item in submissions for row in item]
+            if rows:
+                try:
+                    self._write_with_retries(rows)
+                except sqlite3.OperationalError as e:
+                    app.logger.error('Dropping %d chat message(s) after repeated write failures: %s', len(rows), e)
+                except sqlite3.Error:
+                    # A permanent error (e.g. a constraint violation) in one submission mustn't cost the others
+                    for item in submissions:
+                        try:
+                            self._write_with_retries(item)
+                        except sqlite3.Error as e:
+                            app.logger.error('Dropping %d chat message(s): %s', len(item), e)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_with_retries(self, rows):
+        for attempt in range(app.config['CHAT_WRITE_RETRIES'] + 1):
+            try:
+                return self._write(rows)
+            except sqlite3.OperationalError as e:
+                if attempt == app.config['CHAT_WRITE_RETRIES']:
+                    raise
+                app.logger.warning('Chat write failed, retrying: %s', e)
+                time.sleep(app.config['CHAT_WRITE_TIMEOUT'])
+
+    def _write(self, rows):
+        pool = get_db_pool()
+        conn = pool.acquire()
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO chat_messages (id, user_id, message, is_user, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            pool.release(conn)
+
+chat_writer = ChatWriter()
+
+app.config['CHAT_CONTEXT_SIZE'] = 10
+app.config['CHAT_CONTEXT_USERS'] = 10000
+app.config['CHAT_CONTEXT_TTL'] = 300
+
+CHAT_HISTORY_PAGE_SIZE = 50
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
+
+class ChatContext:
+    """Per-user ring buffers of the most recent chat messages
+
+    A user's buffer is loaded from chat_messages the first time it is needed
+    and then appended to in memory, so building bot context never queries the
+    table per message. Buffers are per worker; the TTL bounds how long one
+    can miss exchanges handled by another worker.
+    """
+
+    def __init__(self):
+        self._buffers = LRUCache(app.config['CHAT_CONTEXT_USERS'], app.config['CHAT_CONTEXT_TTL'])
+
+    def get(self, conn, user_id):
+        """Return the user's recent messages, oldest first, as {'message', 'is_user'} dicts"""
+        buffer = self._buffers.get(user_id)
+        if buffer is None:
+            rows = conn.execute('''
+                SELECT message, is_user FROM chat_messages
+                WHERE user_id = ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            ''', (user_id, app.config['CHAT_CONTEXT_SIZE'])).fetchall()
+            buffer = deque(({'message': row['message'], 'is_user': bool(row['is_user'])} for row in reversed(rows)),
+                           maxlen=app.config['CHAT_CONTEXT_SIZE'])
+            self._buffers.set(user_id, buffer)
+        return list(buffer)
+
+    def append(self, user_id, messages):
+        """Add messages to the user's buffer if it is loaded"""
+        buffer = self._buffers.get(user_id)
+        if buffer is not None:
+            buffer.extend(messages)
+
+chat_context = ChatContext()
+
+def record_chat_exchange(user_id, message, asked_at, response):
+    """Queue a question and its reply for persistence and add them to the user's context"""
+    chat_writer.submit([
+        (generate_id(), user_id, message, 1, asked_at),
+        (generate_id(), user_id, response, 0, chat_timestamp()),
+    ])
+    chat_context.append(user_id, [{'message': message, 'is_user': True}, {'message': response, 'is_user': False}])
+
+# =============================================================================
+# INTERNSHIP LISTING
+# =============================================================================
+
+INTERNSHIPS_PAGE_SIZE = 20
+INTERNSHIPS_MAX_PAGE_SIZE = 100
+
+def encode_cursor(created_at, row_id):
+    """Encode the (created_at, id) keyset position as an opaque URL-safe token"""
+    raw = json.dumps([created_at, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor(), raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValueError('Invalid cursor')
+    return created_at, row_id
+
+INTERNSHIP_STATUSES = ('ACTIVE', 'CLOSED')
+SEARCH_RESULTS_LIMIT = 50
+SNIPPET_START, SNIPPET_END = '\x02', '\x03'
+
+def fts_query(text):
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix"""
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+def render_snippet(snippet):
+    """HTML-escape an FTS snippet and turn its match markers into <mark> tags"""
+    return (html.escape(snippet)
+            .replace(SNIPPET_START, '<mark>')
+            .replace(SNIPPET_END, '</mark>'))
+
+def search_internships(cursor, text, limit=SEARCH_RESULTS_LIMIT, internship_type=None, location=None):
+    """Full-text search over active internships, best BM25 match first"""
+    match = fts_query(text)
+    if not match:
+        return []
+
+    # Rank against the index alone (it only holds active internships) and join
+    # the remaining tables for the top rows only
+    clauses = ['internships_fts MATCH ?']
+    params = [match]
+    if internship_type:
+        clauses.append('i.type = ?')
+        params.append(internship_type)
+    if location:
+        clauses.append('i.location = ?')
+        params.append(location)
+    join = 'JOIN internships i ON i.id = internships_fts.internship_id' if len(clauses) > 1 else ''
+
+    # Column weights: internship id (not indexed), title, description, company name, skills
+    cursor.execute(f'''
+        SELECT i.*, c.name as company_name, i.application_count as applications,
+               snippet(internships_fts, 2, ?, ?, '…', 24) as snippet, top.rank
+        FROM (
+            SELECT internships_fts.rowid as docid, bm25(internships_fts, 0.0, 10.0, 1.0, 4.0, 6.0) as rank
+            FROM internships_fts {join}
+            WHERE {' AND '.join(clauses)}
+            ORDER BY rank
+            LIMIT ?
+        ) top
+        JOIN internships_fts ON internships_fts.rowid = top.docid
+        JOIN internships i ON i.id = internships_fts.internship_id
+        LEFT JOIN companies c ON i.company_id = c.id
+        WHERE internships_fts MATCH ?
+        ORDER BY top.rank
+    ''', [SNIPPET_START, SNIPPET_END] + params + [limit, match])
+    results = [dict(row) for row in cursor.fetchall()]
+    for result in results:
+        result['snippet'] = render_snippet(result['snippet'])
+
+    attach_skills(cursor, results)
+    return results
+
+def fetch_internships_page(cursor, after=None, limit=INTERNSHIPS_PAGE_SIZE,
+                           internship_type=None, location=None, search=None):
+    """Fetch one page of active internships, newest first, using keyset pagination
+
+    Returns the page (with skills attached) and the cursor for the next page,
+    or None when there are no more rows.
+    """
+    clauses = ["i.status = 'ACTIVE'"]
+    params = []
+    if internship_type:
+        clauses.append('i.type = ?')
+        params.append(internship_type)
+    if location:
+        clauses.append('i.location = ?')
+        params.append(location)
+    match = fts_query(search) if search else None
+    if match:
+        clauses.append('i.id IN (SELECT internship_id FROM internships_fts WHERE internships_fts MATCH ?)')
+        params.append(match)
+    if after:
+        clauses.append('(i.created_at, i.id) < (?, ?)')
+        params.extend(after)
+
+    cursor.execute(f'''
+        SELECT i.*, c.name as company_name, i.application_count as applications
+        FROM internships i
+        LEFT JOIN companies c ON i.company_id = c.id
+        WHERE {' AND '.join(clauses)}
+        ORDER BY i.created_at DESC, i.id DESC
+        LIMIT ?
+    ''', params + [limit + 1])
+    internships = [dict(row) for row in cursor.fetchall()]
+
+    next_cursor = None
+    if len(internships) > limit:
+        internships = internships[:limit]
+        last = internships[-1]
+        next_cursor = encode_cursor(last['created_at'], last['id'])
+
+    attach_skills(cursor, internships)
+    return internships, next_cursor
+
+# =============================================================================
+# SKILL MATCHING
+# =============================================================================
+
+MAX_PROFICIENCY = 5
+RECOMMENDATIONS_DEFAULT_K = 10
+RECOMMENDATIONS_MAX_K = 50
+DASHBOARD_RECOMMENDATIONS = 3
+
+class SkillMatcher:
+    """Sparse internships × skills matrix for batch skill matching
+
+    Active internships and skills are numbered densely and the matrix is kept in
+    CSC form (for each skill, the internships requiring it). A batch of students
+    becomes a CSR students × skills matrix of proficiency weights, and their
+    scores are its product with the internships matrix, computed row by row
+    (Gustavson): one bincount over the columns of each student's skills, ranking
+    only the internships sharing at least one of them. Slicing the product over
+    many students at once needs a sort to sum each pair and measured no faster.
+
+    A student's score for an internship is the proficiency-weighted fraction of
+    the internship's required skills they have, between 0 and 1.
+
+    The matrix is reloaded whenever the 'internships' data version has moved
+    since it was built, so a write handled by any worker is seen by all of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        # (generation, 'internships' data version) the current matrix was built at
+        self._loaded = None
+        # (internship_ids, skill_index, indptr, indices, inv_required), replaced as a whole on reload
+        self._matrix = (np.empty(0, dtype=object), {}, np.zeros(1, dtype=np.int64),
+                        np.empty(0, dtype=np.int32), np.empty(0))
+
+    def invalidate(self):
+        """Force a reload on next use"""
+        with self._lock:
+            self._generation += 1
+
+    def ensure_loaded(self, conn):
+        """Load the skill graph if it was never loaded, invalidated or the 'internships' data version moved"""
+        # Read before the rows: a write landing in between only costs one extra reload
+        version = read_data_versions(conn, ['internships'])[0].get('internships', 0)
+        if self._loaded == (self._generation, version):
+            return
+        with self._lock:
+            # Record the generation read before loading so a concurrent invalidate() still counts
+            state = (self._generation, version)
+            if self._loaded != state:
+                self._load(conn)
+                self._loaded = state
+
+    def _load(self, conn):
+        rows = conn.execute('''
+            SELECT isk.internship_id, isk.skill_id
+            FROM internships i
+            JOIN internship_skills isk ON isk.internship_id = i.id
+            WHERE i.status = 'ACTIVE'
+            ORDER BY i.created_at DESC, i.id DESC
+        ''').fetchall()
+        self._build(rows)
+
+    def _build(self, rows):
+        """Build the matrix from (internship_id, skill_id) rows, newest internship first"""
+        index_of, skill_index = {}, {}
+        internship_col = np.fromiter((index_of.setdefault(internship_id, len(index_of)) for internship_id, _ in rows),
+                                     dtype=np.int32, count=len(rows))
+        skill_col = np.fromiter((skill_index.setdefault(skill_id, len(skill_index)) for _, skill_id in rows),
+                                dtype=np.int32, count=len(rows))
+
+        order = np.argsort(skill_col, kind='stable')
+        indptr = np.zeros(len(skill_index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(skill_col, minlength=len(skill_index)), out=indptr[1:])
+        required = np.bincount(internship_col, minlength=len(index_of))
+
+        internship_ids = np.empty(len(index_of), dtype=object)
+        internship_ids[:] = list(index_of)
+
+        # Swap in the new matrix in one assignment so concurrent readers never mix versions
+        self._matrix = (internship_ids, skill_index, indptr, internship_col[order],
+                        1.0 / np.maximum(required, 1))
+
+    @staticmethod
+    def _student_matrix(skill_index, students):
+        """CSR students × skills matrix (indptr, columns, weights) over the loaded skill columns"""
+        indptr, cols, weights = [0], [], []
+        for student_skills in students:
+            for skill_id, proficiency in student_skills.items():
+                col = skill_index.get(skill_id)
+                if col is not None:
+                    cols.append(col)
+                    weights.append(min(max(proficiency or 1, 1), MAX_PROFICIENCY) / MAX_PROFICIENCY)
+            indptr.append(len(cols))
+        return np.array(indptr, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(weights)
+
+    @staticmethod
+    def _top_k_row(matrix, cols, weights, k):
+        """Rank the internships for one student row of (skill columns, weights)"""
+        internship_ids, _, indptr, indices, inv_required = matrix
+        starts = indptr[cols]
+        counts = indptr[cols + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return []
+
+        # Row × CSC matrix: the internships requiring each of the student's skills, weighted by proficiency
+        idx = indices[np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)]
+        totals = np.bincount(idx, weights=np.repeat(weights, counts), minlength=len(inv_required))
+
+        # Accumulate densely (one bincount) but rank only the internships actually touched
+        touched = np.sort(idx)
+        touched = touched[np.concatenate(([True], touched[1:] != touched[:-1]))]
+        scores = np.round(totals[touched] * inv_required[touched], 4)
+
+        candidates = np.arange(len(touched))
+        if len(touched) > k:
+            # Keep everything tied with the k-th score so the tie-break below is exact
+            kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+            candidates = np.flatnonzero(scores >= kth)
+        # touched is ascending and lower indexes are newer postings, so a stable sort breaks ties by recency
+        best = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+        return [(internship_ids[touched[pos]], float(scores[pos])) for pos in best]
+
+    def top_k(self, student_skills, k=RECOMMENDATIONS_DEFAULT_K):
+        """Return the k best (internship_id, score) pairs for one student, ties going to the newest posting"""
+        return self.top_k_batch({None: student_skills}, k)[None]
+
+    def top_k_batch(self, students, k=RECOMMENDATIONS_DEFAULT_K):
+        """Run top_k() for a {user_id: skill vector} mapping against one snapshot of the matrix"""
+        matrix = self._matrix
+        indptr, cols, weights = self._student_matrix(matrix[1], students.values())
+        return {user_id: self._top_k_row(matrix, cols[indptr[row]:indptr[row + 1]],
+                                         weights[indptr[row]:indptr[row + 1]], k)
+                for row, user_id in enumerate(students)}
+
+skill_matcher = SkillMatcher()
+
+def load_student_skills(conn, user_ids):
+    """Load {user_id: {skill_id: proficiency}} vectors for the given students"""
+    students = {user_id: {} for user_id in user_ids}
+    cursor = conn.execute('''
+        SELECT user_id, skill_id, proficiency FROM student_skills
+        WHERE user_id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(list(students)),))
+    for user_id, skill_id, proficiency in cursor:
+        students[user_id][skill_id] = proficiency
+    return students
+
+def fetch_internships_by_ids(cursor, internship_ids):
+    """Fetch listing rows for the given ids, keeping their order and skipping missing ones"""
+    cursor.execute('''
+        SELECT i.*, c.name as company_name, i.application_count as applications
+        FROM internships i
+        LEFT JOIN companies c ON i.company_id = c.id
+        WHERE i.id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(list(internship_ids)),))
+    by_id = {row['id']: dict(row) for row in cursor.fetchall()}
+    internships = [by_id[internship_id] for internship_id in internship_ids if internship_id in by_id]
+    attach_skills(cursor, internships)
+    return internships
+
+app.config['RECOMMENDATION_CACHE_SIZE'] = 10000
+app.config['RECOMMENDATION_CACHE_TTL'] = 60
+
+class RecommendationCache:
+    """Precomputed per-student rankings: an in-process LRU in front of the recommendations table
+
+    Rankings are computed once and read back on every dashboard load. Changes
+    to a student's skills, or to an internship's skills or status, invalidate
+    only the affected students and queue them for a background refresh. Other
+    workers' LRU entries expire after RECOMMENDATION_CACHE_TTL seconds, or as
+    soon as a conditional request sees newer data versions, after which they
+    read the refreshed table row.
+    """
+
+    def __init__(self):
+        self._lru = LRUCache(app.config['RECOMMENDATION_CACHE_SIZE'], app.config['RECOMMENDATION_CACHE_TTL'])
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+
+    def get(self, conn, user_id):
+        """Return the student's [(internship_id, score), ...] ranking, computing it on first use"""
+        version = request_data_versions('internships', f'user:{user_id}')
+        cached = self._lru.get(user_id)
+        if cached is not None and (version is None or cached[0] == version):
+            return cached[1]
+
+        row = conn.execute('SELECT ranking FROM recommendations WHERE user_id = ?', (user_id,)).fetchone()
+        if row:
+            ranking = [tuple(item) for item in json.loads(row['ranking'])]
+        else:
+            ranking = self.refresh(conn, [user_id])[user_id]
+        self._lru.set(user_id, (version, ranking))
+        return ranking
+
+    def refresh(self, conn, user_ids):
+        """Recompute and persist rankings for the given students in one batch"""
+        skill_matcher.ensure_loaded(conn)
+        rankings = skill_matcher.top_k_batch(load_student_skills(conn, user_ids), RECOMMENDATIONS_MAX_K)
+        with conn:
+            conn.executemany('''
+                INSERT INTO recommendations (user_id, ranking, computed_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id) DO UPDATE SET ranking = excluded.ranking, computed_at = excluded.computed_at
+            ''', [(user_id, json.dumps(ranking)) for user_id, ranking in rankings.items()])
+        for user_id, ranking in rankings.items():
+            self._lru.set(user_id, (None, ranking))
+        return rankings
+
+    def invalidate_students(self, conn, user_ids):
+        """Drop the given students' rankings and queue them for a background refresh"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        with conn:
+            conn.execute('DELETE FROM recommendations WHERE user_id IN (SELECT value FROM json_each(?))',
+                         (json.dumps(user_ids),))
+        for user_id in user_ids:
+            self._lru.pop(user_id)
+        with self._lock:
+            self._ensure_started()
+            self._pending.update(user_ids)
+        self._wake.set()
+
+    def invalidate_internships(self, conn, internship_ids, extra_skill_ids=()):
+        """Invalidate every student sharing a skill with the given internships
+
+        Pass the skills an internship just lost as extra_skill_ids, since they are
+        no longer in internship_skills.
+        """
+        skill_matcher.invalidate()
+        cursor = conn.execute('''
+            SELECT DISTINCT ss.user_id FROM student_skills ss
+            WHERE ss.skill_id IN (
+                SELECT skill_id FROM internship_skills WHERE internship_id IN (SELECT value FROM json_each(?))
+                UNION SELECT value FROM json_each(?)
+            )
+        ''', (json.dumps(list(internship_ids)), json.dumps(list(extra_skill_ids))))
+        self.invalidate_students(conn, [row['user_id'] for row in cursor])
+
+    def _ensure_started(self):
+        # Started lazily (and restarted after a fork) so every worker refreshes its own queue
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='recommendation-refresh', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                user_ids, self._pending = list(self._pending), set()
+            if not user_ids:
+                continue
+            pool = get_db_pool()
+            conn = pool.acquire()
+            try:
+                self.refresh(conn, user_ids)
+            except sqlite3.Error as e:
+                app.logger.warning('Recommendation refresh failed: %s', e)
+            finally:
+                pool.release(conn)
+
+recommendation_cache = RecommendationCache()
+
+def recommend_internships(conn, user_id, k=RECOMMENDATIONS_DEFAULT_K):
+    """Return a student's precomputed best skill matches as listing rows, best first"""
+    ranked = recommendation_cache.get(conn, user_id)[:k]
+    student_skills = load_student_skills(conn, [user_id])[user_id]
+
+    # Rankings cached by another worker may still list an internship closed since
+    internships = [internship for internship in
+                   fetch_internships_by_ids(conn.cursor(), [internship_id for internship_id, _ in ranked])
+                   if internship['status'] == 'ACTIVE']
+    scores = dict(ranked)
+    for internship in internships:
+        internship['match_score'] = scores[internship['id']]
+        internship['matched_skills'] = [skill['name'] for skill in internship['skills']
+                                        if skill['id'] in student_skills]
+    return internships
+
+# =============================================================================
+# USER CACHE
+# =============================================================================
+
+app.config['USER_CACHE_SIZE'] = 10000
+app.config['USER_CACHE_TTL'] = 30
+# Carry SESSION_USER_FIELDS in the (signed, not encrypted) session cookie so the
+# dashboard renders without a user lookup at all
+app.config['USER_IN_SESSION'] = False
+
+USER_FIELDS = ('id', 'email', 'name', 'role', 'phone', 'college_tier', 'college_name', 'year', 'bio', 'created_at')
+SESSION_USER_FIELDS = ('id', 'name', 'role', 'college_tier', 'college_name', 'year')
+PROFILE_EDITABLE_FIELDS = ('name', 'phone', 'college_tier', 'college_name', 'year', 'bio')
+
+user_cache = LRUCache(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+
+def get_user(conn, user_id):
+    """Return a user's row without the password hash, or None, through the per-worker cache"""
+    version = request_data_versions(f'user:{user_id}')
+    cached = user_cache.get(user_id)
+    if cached is None or (version is not None and cached[0] != version):
+        row = conn.execute(f"SELECT {', '.join(USER_FIELDS)} FROM users WHERE id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        cached = (version, dict(row))
+        user_cache.set(user_id, cached)
+    return dict(cached[1])
+
+def invalidate_user(user_id):
+    """Drop a user's cached row; other workers pick up the change on their next conditional render, or within USER_CACHE_TTL"""
+    user_cache.pop(user_id)
+
+def remember_user(user):
+    """Store the signed-in user's identity, and rendering fields if enabled, in the session"""
+    session['user_id'] = user['id']
+    session['name'] = user['name']
+    session['role'] = user['role']
+    if app.config['USER_IN_SESSION']:
+        session['user'] = {field: user.get(field) for field in SESSION_USER_FIELDS}
+
+def current_user():
+    """Return the signed-in user's rendering fields, from the session when carried there"""
+    user = session.get('user')
+    if app.config['USER_IN_SESSION'] and user and user.get('id') == session['user_id']:
+        return user
+    return get_user(get_db_connection(), session['user_id'])
+
+# =============================================================================
+# DASHBOARD STATS
+# =============================================================================
+
+app.config['STATS_CACHE_TTL'] = 30
+
+stats_cache = LRUCache(1, app.config['STATS_CACHE_TTL'])
+
+def dashboard_stats(conn):
+    """Active internships, remote ones, skills they require and companies hiring, through the per-worker cache"""
+    version = request_data_versions('internships')
+    cached = stats_cache.get('dashboard')
+    if cached is None or (version is not None and cached[0] != version):
+        # Each count is answered from an index: the EXISTS forms stop at the first active posting
+        stats = dict(conn.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM internships WHERE status = 'ACTIVE') AS internships,
+                (SELECT COUNT(*) FROM internships WHERE status = 'ACTIVE' AND location = 'Remote') AS remote,
+                (SELECT COUNT(*) FROM skills s WHERE EXISTS (
+                    SELECT 1 FROM internship_skills isk JOIN internships i ON i.id = isk.internship_id
+                    WHERE isk.skill_id = s.id AND i.status = 'ACTIVE')) AS skills,
+                (SELECT COUNT(*) FROM companies c WHERE EXISTS (
+                    SELECT 1 FROM internships i WHERE i.company_id = c.id AND i.status = 'ACTIVE')) AS companies
+        ''').fetchone())
+        cached = (version, stats)
+        stats_cache.set('dashboard', cached)
+    return dict(cached[1])
+
+def invalidate_dashboard_stats():
+    """Drop the cached counts; other workers pick up the change on their next conditional render"""
+    stats_cache.clear()
+
+# =============================================================================
+# BULK IMPORT
+# =============================================================================
+
+IMPORT_KINDS = ('companies', 'skills', 'internships')
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_SKILL_CATEGORY = 'Other'
+# Invalid rows are counted; only this many are kept for the report
+IMPORT_MAX_ERRORS = 20
+# Per-row search index and data version triggers; the importer handles a whole chunk in one statement instead
+IMPORT_DEFERRED_TRIGGERS = ('internships_fts_insert', 'internship_skills_fts_insert',
+                            'internships_version_insert', 'internship_skills_version_insert')
+
+class ImportRowError(ValueError):
+    """A feed row that cannot be imported"""
+
+def read_feed(path):
+    """Stream (line number, row dict) pairs from a .csv or JSON Lines file; row is None if unparsable"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+def feed_list(value):
+    """Read a list field: a JSON array, or a '|'-separated string in CSV feeds"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split('|')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+def feed_int(row, field, required=False):
+    """Read an integer field, raising ImportRowError when it is missing or malformed"""
+    value = row.get(field)
+    if value in (None, ''):
+        if required:
+            raise ImportRowError(f'{field} is required')
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ImportRowError(f'{field} must be an integer') from None
+
+def feed_timestamp(row, field):
+    """Read an ISO 8601 timestamp as UTC in CURRENT_TIMESTAMP's format, so it sorts with stored ones"""
+    value = feed_text(row, field)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f'{field} must be an ISO 8601 timestamp') from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def feed_text(row, field, required=False):
+    """Read a text field, raising ImportRowError when a required one is empty"""
+    value = row.get(field)
+    value = str(value).strip() if value is not None else ''
+    if required and not value:
+        raise ImportRowError(f'{field} is required')
+    return value or None
+
+class FeedImporter:
+    """Streaming, chunked loader for companies, skills and internships feeds
+
+    Rows are validated and resolved in Python, then written IMPORT_CHUNK_SIZE
+    at a time with executemany in one transaction per chunk, so memory stays
+    flat however long the feed is. Company, skill and recruiter references
+    resolve through in-memory name maps loaded once; unknown skills are
+    created. For internships the per-row search triggers are dropped inside
+    each chunk's transaction, the chunk is indexed and its data version bumped
+    with single statements, and the triggers are recreated before commit, so
+    other connections never see them missing.
+    """
+
+    def __init__(self, conn, kind, chunk_size=IMPORT_CHUNK_SIZE, posted_by=None):
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Kind must be one of {', '.join(IMPORT_KINDS)}")
+        self.conn = conn
+        self.kind = kind
+        self.chunk_size = chunk_size
+        self.stats = Counter()
+        self.errors = []
+        self._skills = {row['name'].lower(): row['id'] for row in conn.execute('SELECT id, name FROM skills')}
+        self._companies = {row['name'].lower(): row['id'] for row in conn.execute('SELECT id, name FROM companies')}
+        self._company_ids = set(self._companies.values())
+        self._recruiters = {}
+        for row in conn.execute("SELECT id, email FROM users WHERE role = 'RECRUITER'"):
+            self._recruiters[row['id']] = row['id']
+            self._recruiters[row['email'].lower()] = row['id']
+        self._default_recruiter = self._recruiter(posted_by) if posted_by else None
+        self._new_skills = []
+        # Active postings inserted so far, whose matching students need fresh rankings
+        self._matchable_ids = []
+
+    def run(self, rows):
+        """Import every row, returning counts of inserted, skipped and invalid rows"""
+        prepare = getattr(self, f'_prepare_{self.kind}')
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.chunk_size))
+            if not batch:
+                break
+            chunk = []
+            for number, row in batch:
+                try:
+                    if row is None:
+                        raise ImportRowError('malformed row')
+                    prepared = prepare(row)
+                except ImportRowError as e:
+                    self.stats['invalid'] += 1
+                    if len(self.errors) < IMPORT_MAX_ERRORS:
+                        self.errors.append((number, str(e)))
+                    continue
+                if prepared is None:
+                    self.stats['skipped'] += 1
+                else:
+                    chunk.append(prepared)
+            if chunk:
+                self._write(chunk)
+        if self.kind == 'internships' and self.stats['inserted']:
+            # Only students sharing a skill with a new active posting are re-ranked
+            recommendation_cache.invalidate_internships(self.conn, self._matchable_ids)
+            invalidate_dashboard_stats()
+        return self.stats
+
+    def _recruiter(self, reference):
+        recruiter_id = self._recruiters.get(reference) or self._recruiters.get(reference.lower())
+        if recruiter_id is None:
+            raise ImportRowError(f'unknown recruiter {reference!r}')
+        return recruiter_id
+
+    def _skill(self, name):
+        skill_id = self._skills.get(name.lower())
+        if skill_id is None:
+            skill_id = self._skills[name.lower()] = generate_id()
+            self._new_skills.append((skill_id, name, IMPORT_SKILL_CATEGORY))
+        return skill_id
+
+    def _prepare_skills(self, row):
+        name = feed_text(row, 'name', required=True)
+        if name.lower() in self._skills:
+            return None
+        skill_id = self._skills[name.lower()] = generate_id()
+        return (skill_id, name, feed_text(row, 'category') or IMPORT_SKILL_CATEGORY)
+
+    def _prepare_companies(self, row):
+        name = feed_text(row, 'name', required=True)
+        company_id = feed_text(row, 'id') or generate_id()
+        if name.lower() in self._companies or company_id in self._company_ids:
+            return None
+        self._companies[name.lower()] = company_id
+        self._company_ids.add(company_id)
+        return (company_id, name, feed_text(row, 'description'), feed_text(row, 'industry'),
+                feed_text(row, 'website'), feed_text(row, 'location'), feed_text(row, 'logo'))
+
+    def _prepare_internships(self, row):
+        status = feed_text(row, 'status') or 'ACTIVE'
+        if status not in INTERNSHIP_STATUSES:
+            raise ImportRowError(f"status must be one of {', '.join(INTERNSHIP_STATUSES)}")
+
+        company_id = feed_text(row, 'company_id')
+        if company_id is None and feed_text(row, 'company'):
+            company_id = self._companies.get(feed_text(row, 'company').lower())
+            if company_id is None:
+                raise ImportRowError(f"unknown company {row['company']!r}")
+        elif company_id is not None and company_id not in self._company_ids:
+            raise ImportRowError(f'unknown company id {company_id!r}')
+
+        posted_by = feed_text(row, 'posted_by')
+        posted_by_id = self._recruiter(posted_by) if posted_by else self._default_recruiter
+        if posted_by_id is None:
+            raise ImportRowError('posted_by is required')
+
+        internship_id = feed_text(row, 'id') or generate_id()
+        return (
+            (internship_id, feed_text(row, 'title', required=True), feed_text(row, 'description', required=True),
+             feed_text(row, 'location', required=True), feed_text(row, 'type', required=True),
+             feed_int(row, 'duration', required=True), feed_int(row, 'stipend'), posted_by_id, company_id,
+             status, feed_timestamp(row, 'created_at')),
+            [self._skill(name) for name in dict.fromkeys(feed_list(row.get('skills')))],
+        )
+
+    def _write(self, chunk):
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self._new_skills:
+                conn.executemany('INSERT INTO skills (id, name, category) VALUES (?, ?, ?) ON CONFLICT DO NOTHING',
+                                 self._new_skills)
+                self.stats['skills created'] += len(self._new_skills)
+            getattr(self, f'_write_{self.kind}')(chunk)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self._new_skills = []
+
+    def _write_skills(self, chunk):
+        cursor = self.conn.executemany(
+            'INSERT INTO skills (id, name, category) VALUES (?, ?, ?) ON CONFLICT DO NOTHING', chunk)
+        self.stats['inserted'] += cursor.rowcount
+
+    def _write_companies(self, chunk):
+        cursor = self.conn.executemany('''
+            INSERT INTO companies (id, name, description, industry, website, location, logo)
+            VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING
+        ''', chunk)
+        self.stats['inserted'] += cursor.rowcount
+
+    def _write_internships(self, chunk):
+        conn = self.conn
+        # Only postings new to the database (first occurrence within the chunk) get skills and indexing;
+        # the write lock is held, so nothing can insert them between this read and the insert
+        existing = {row['id'] for row in conn.execute(
+            'SELECT id FROM internships WHERE id IN (SELECT value FROM json_each(?))',
+            (json.dumps([internship[0] for internship, _ in chunk]),))}
+        new = {}
+        for internship, skill_ids in chunk:
+            if internship[0] not in existing and internship[0] not in new:
+                new[internship[0]] = (internship, skill_ids)
+        self.stats['inserted'] += len(new)
+        self.stats['skipped'] += len(chunk) - len(new)
+        if not new:
+            return
+        self._matchable_ids.extend(internship_id for internship_id, (internship, _) in new.items()
+                                   if internship[9] == 'ACTIVE')
+
+        for trigger in IMPORT_DEFERRED_TRIGGERS:
+            conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+
+        conn.executemany('''
+            INSERT INTO internships (id, title, description, location, type, duration, stipend,
+                                     posted_by_id, company_id, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', [internship for internship, _ in new.values()])
+
+        conn.executemany('''
+            INSERT INTO internship_skills (id, internship_id, skill_id) VALUES (?, ?, ?) ON CONFLICT DO NOTHING
+        ''', [(generate_id(), internship_id, skill_id)
+              for internship_id, (_, skill_ids) in new.items() for skill_id in skill_ids])
+
+        chunk_ids = json.dumps(list(new))
+        chunk_filter = 'i.id IN (SELECT value FROM json_each(?))'
+        conn.execute(fts_assign_docids(chunk_filter), (chunk_ids,))
+        conn.execute(f'{FTS_INSERT} {FTS_DOCUMENT_SELECT} AND {chunk_filter}', (chunk_ids,))
+
+        conn.execute(bump_data_version("'internships'"))
+
+        for statement in fts_sync_triggers(IMPORT_DEFERRED_TRIGGERS) + data_version_triggers(IMPORT_DEFERRED_TRIGGERS):
+            conn.execute(statement)
+
+# =============================================================================
+# APPLICATIONS
+# =============================================================================
+
+BULK_APPLY_MAX = 100
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+def apply_to_internships(conn, user_id, internship_ids, idempotency_key=None):
+    """Apply a user to active internships in one conflict-aware insert
+
+    Returns {internship_id: (outcome, application_id)} where outcome is 'applied',
+    'already_applied' or 'unavailable'. Repeating a call with the same idempotency
+    key reports 'applied' again instead of a conflict. Each internship gets its own
+    key (the given key plus its id) so one key can cover a whole bulk request.
+    """
+    def item_key(internship_id):
+        return f'{idempotency_key}:{internship_id}' if idempotency_key else None
+
+    items = [{'id': generate_id(), 'internship_id': internship_id, 'key': item_key(internship_id)}
+             for internship_id in internship_ids]
+    # WHERE keeps SQLite from reading ON CONFLICT as part of the join; a conflict on
+    # (user_id, internship_id) or (user_id, idempotency_key) skips just that row
+    inserted = conn.execute('''
+        INSERT INTO applications (id, user_id, internship_id, status, idempotency_key)
+        SELECT json_extract(j.value, '$.id'), ?, i.id, 'PENDING', json_extract(j.value, '$.key')
+        FROM json_each(?) j
+        JOIN internships i ON i.id = json_extract(j.value, '$.internship_id')
+        WHERE i.status = 'ACTIVE'
+        ON CONFLICT DO NOTHING
+        RETURNING internship_id, id
+    ''', (user_id, json.dumps(items))).fetchall()
+    conn.commit()
+
+    results = {row['internship_id']: ('applied', row['id']) for row in inserted}
+    missing = [internship_id for internship_id in internship_ids if internship_id not in results]
+    if missing:
+        existing = conn.execute('''
+            SELECT internship_id, id, idempotency_key FROM applications
+            WHERE user_id = ? AND internship_id IN (SELECT value FROM json_each(?))
+        ''', (user_id, json.dumps(missing))).fetchall()
+        for row in existing:
+            replayed = idempotency_key is not None and row['idempotency_key'] == item_key(row['internship_id'])
+            results[row['internship_id']] = ('applied' if replayed else 'already_applied', row['id'])
+        for internship_id in missing:
+            results.setdefault(internship_id, ('unavailable', None))
+    return results
+
+def request_idempotency_key(data):
+    """Idempotency key from the Idempotency-Key header or the JSON body, if any"""
+    key = request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+    if key is not None and (not isinstance(key, str) or not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH):
+        raise ValueError(f'Idempotency key must be a string of 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters')
+    return key
+
+# =============================================================================
+# APPLICATION EXPORT
+# =============================================================================
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ('application_id', 'status', 'applied_at', 'internship_id', 'internship_title', 'company_name',
+                 'applicant_name', 'applicant_email', 'college_name', 'college_tier', 'year')
+# Rows serialized per yielded chunk; larger chunks mean fewer, bigger writes to the socket
+EXPORT_CHUNK_ROWS = 500
+
+def export_applications(conn, fmt, recruiter_id=None):
+    """Yield applications as CSV or JSON Lines text chunks, for one recruiter's postings or all
+
+    Rows are pulled from the cursor EXPORT_CHUNK_ROWS at a time and never
+    collected, so memory stays flat whatever the number of applications.
+    """
+    query = '''
+        SELECT a.id, a.status, a.applied_at, i.id, i.title, c.name, u.name, u.email,
+               u.college_name, u.college_tier, u.year
+        FROM internships i
+        JOIN applications a ON a.internship_id = i.id
+        JOIN users u ON u.id = a.user_id
+        LEFT JOIN companies c ON c.id = i.company_id
+    '''
+    params = ()
+    if recruiter_id is not None:
+        query += ' WHERE i.posted_by_id = ?'
+        params = (recruiter_id,)
+    query += ' ORDER BY i.id, a.applied_at'
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+
+    cursor = conn.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+        if not rows:
+            break
+        if writer:
+            writer.writerows(rows)
+        else:
+            buffer.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+# =============================================================================
+# RECRUITER ANALYTICS
+# =============================================================================
+
+ANALYTICS_DAYS = 30
+COLLEGE_TIERS = ('TIER_1', 'TIER_2', 'TIER_3', 'OTHER', 'UNKNOWN')
+APPLICATION_STATUSES = ('PENDING', 'ACCEPTED', 'REJECTED')
+
+def recruiter_analytics(conn, recruiter_id, days=ANALYTICS_DAYS):
+    """Applicant volume per posting, college tier, status and day, read from the rollup tables"""
+    postings = {}
+    for row in conn.execute('''
+        SELECT i.id, i.title, i.status, i.views, i.application_count, i.created_at, c.name AS company_name
+        FROM internships i
+        LEFT JOIN companies c ON c.id = i.company_id
+        WHERE i.posted_by_id = ?
+        ORDER BY i.created_at DESC, i.id DESC
+    ''', (recruiter_id,)):
+        postings[row['id']] = {**dict(row), 'tiers': Counter(), 'statuses': Counter()}
+
+    tiers, statuses = Counter(), Counter()
+    for row in conn.execute('''
+        SELECT r.internship_id, r.college_tier, r.status, r.applications
+        FROM internships i
+        JOIN application_segment_rollups r ON r.internship_id = i.id
+        WHERE i.posted_by_id = ? AND r.applications != 0
+    ''', (recruiter_id,)):
+        posting = postings[row['internship_id']]
+        posting['tiers'][row['college_tier']] += row['applications']
+        posting['statuses'][row['status']] += row['applications']
+        tiers[row['college_tier']] += row['applications']
+        statuses[row['status']] += row['applications']
+
+    daily = {row['day']: dict(row) for row in conn.execute('''
+        SELECT d.day, SUM(d.applications) AS applications, SUM(d.views) AS views
+        FROM internships i
+        JOIN internship_daily_stats d ON d.internship_id = i.id
+        WHERE i.posted_by_id = ? AND d.day > date('now', ?)
+        GROUP BY d.day
+    ''', (recruiter_id, f'-{days} days'))}
+    today = datetime.now(timezone.utc).date()
+    days_list = []
+    for offset in range(days - 1, -1, -1):
+        day = (today - timedelta(days=offset)).isoformat()
+        days_list.append(daily.get(day, {'day': day, 'applications': 0, 'views': 0}))
+
+    return {
+        'postings': list(postings.values()),
+        'tiers': {tier: tiers[tier] for tier in COLLEGE_TIERS if tiers[tier]},
+        'statuses': {status: statuses[status] for status in APPLICATION_STATUSES if statuses[status]},
+        'daily': days_list,
+        'totals': {
+            'postings': len(postings),
+            'active': sum(posting['status'] == 'ACTIVE' for posting in postings.values()),
+            'applications': sum(posting['application_count'] for posting in postings.values()),
+            'views': sum(posting['views'] for posting in postings.values()),
+        },
+    }
+
+def rebuild_rollups(conn):
+    """Recompute the application rollups from scratch; per-day views are kept as they are"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute('DELETE FROM application_segment_rollups')
+        conn.execute('INSERT INTO application_segment_rollups (internship_id, college_tier, status, applications) '
+                     + ROLLUP_SEGMENT_SELECT)
+        conn.execute('UPDATE internship_daily_stats SET applications = 0 WHERE applications != 0')
+        conn.execute('''
+            INSERT INTO internship_daily_stats (internship_id, day, applications)
+            SELECT * FROM (''' + ROLLUP_DAILY_SELECT + ''') WHERE true
+            ON CONFLICT(internship_id, day) DO UPDATE SET applications = excluded.applications
+        ''')
+        conn.execute('DELETE FROM internship_daily_stats WHERE applications = 0 AND views = 0')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def check_rollups(conn):
+    """Count rollup rows that differ from a full recomputation, per table
+
+    Per-day views have no underlying log to recompute them from, so only
+    application counts are compared.
+    """
+    checks = {
+        'internship_daily_stats': ('SELECT internship_id, day, applications FROM internship_daily_stats '
+                                   'WHERE applications != 0', ROLLUP_DAILY_SELECT),
+        'application_segment_rollups': ('SELECT internship_id, college_tier, status, applications '
+                                        'FROM application_segment_rollups WHERE applications != 0',
+                                        ROLLUP_SEGMENT_SELECT),
+    }
+    mismatches = {}
+    for table, (stored, expected) in checks.items():
+        mismatches[table] = sum(
+            conn.execute(f'SELECT COUNT(*) FROM ({left} EXCEPT {right})').fetchone()[0]
+            for left, right in ((stored, expected), (expected, stored)))
+    return mismatches
+
 # =============================================================================
 # AUTHENTICATION DECORATORS
 # =============================================================================
@@ -262,84 +2144,293 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# =============================================================================
+# CONDITIONAL REQUESTS
+# =============================================================================
+
+def compute_app_build():
+    """Hash this module and every static file, so any deploy changes the result"""
+    digest = hashlib.sha1()
+    # Precompressed .gz/.br variants are derived from the files beside them
+    paths = [__file__] + sorted(os.path.join(root, name)
+                                for root, _, names in os.walk(app.static_folder) for name in names
+                                if not name.endswith(('.gz', '.br')))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(os.path.relpath(path, app.root_path).encode())
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+# Any code, template or asset change must invalidate validators handed out by the previous build
+APP_BUILD = compute_app_build()
+
+def read_data_versions(conn, names):
+    """Return ({name: version}, latest updated_at) for the given data_versions counters"""
+    rows = conn.execute('SELECT name, version, updated_at FROM data_versions WHERE name IN (SELECT value FROM json_each(?))',
+                        (json.dumps(names),)).fetchall()
+    versions = {row['name']: row['version'] for row in rows}
+    updated = max((row['updated_at'] for row in rows), default=None)
+    return versions, updated and datetime.strptime(updated, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+def request_data_versions(*names):
+    """Counter values conditional_on read for this request, or None if it read none of them
+
+    Per-worker caches store these beside an entry and treat a mismatch as a
+    miss, so a page validated against newer counters (possibly bumped by
+    another worker) is never rendered from an older cache entry.
+    """
+    versions = g.get('data_versions') if has_request_context() else None
+    if versions is None or any(name not in versions for name in names):
+        return None
+    return tuple(versions[name] for name in names)
+
+def conditional_on(*scopes):
+    """Answer GETs with 304 when the client's copy is current, before the view does any work
+
+    Scopes name data_versions counters; 'user' stands for the signed-in user's
+    own counter. Validators are weak ETags over the counters, the user and
+    APP_BUILD, plus a Last-Modified from the newest counter.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+
+            user_id = session.get('user_id')
+            names = [f'user:{user_id}' if scope == 'user' else scope for scope in scopes]
+            versions, last_modified = read_data_versions(get_db_connection(), names)
+            g.data_versions = {name: versions.get(name, 0) for name in names}
+            etag = hashlib.sha1(json.dumps([APP_BUILD, user_id, [versions.get(name, 0) for name in names]])
+                                .encode()).hexdigest()
+
+            # If-None-Match wins over If-Modified-Since, whose one-second resolution can miss changes
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = bool(last_modified and request.if_modified_since
+                                    and last_modified <= request.if_modified_since)
+
+            response = Response(status=304) if not_modified else make_response(f(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                if last_modified:
+                    response.last_modified = last_modified
+                response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
 # =============================================================================
 # AI CHATBOT KNOWLEDGE BASE
 # =============================================================================
 
 CHAT_KNOWLEDGE = {
-    'resume': [
-        "Keep your resume concise - ideally 1-2 pages",
-        "Use action verbs like 'developed', 'implemented', 'achieved'",
-        "Quantify your achievements with numbers where possible",
-        "Tailor your resume to each job description",
-        "Include relevant projects and internships",
-        "Use a clean, professional format",
-        "Proofread multiple times for errors",
-        "Include your technical skills prominently",
-    ],
-    'interview': [
-        "Research the company thoroughly before the interview",
-        "Practice common interview questions out loud",
-        "Prepare examples using the STAR method (Situation, Task, Action, Result)",
-        "Ask thoughtful questions to the interviewer",
-        "Dress professionally even for video interviews",
-        "Test your technology beforehand for remote interviews",
-        "Be authentic and honest about your skills",
-        "Follow up with a thank you email within 24 hours",
-    ],
-    'skills': [
-        "Focus on in-demand skills like Python, JavaScript, React, Node.js",
-        "Build personal projects to demonstrate your skills",
-        "Contribute to open-source projects",
-        "Practice coding problems on platforms like LeetCode",
-        "Learn cloud platforms like AWS or Azure",
-        "Understand database fundamentals",
-        "Develop soft skills like communication and teamwork",
-        "Stay updated with industry trends",
-    ],
-    'internship': [
-        "Start applying early - 2-3 months before you want to start",
-        "Apply to 10-15 internships for best results",
-        "Network with alumni and professionals",
-        "Attend career fairs and company events",
-        "Use your college career center resources",
-        "Follow up on applications after 1-2 weeks",
-        "Don't get discouraged by rejections",
-        "Learn from each interview experience",
-    ],
-    'tier23': [
-        "Your skills matter more than your college tier",
-        "Many companies actively seek diverse talent from all colleges",
-        "Build a strong portfolio of projects",
-        "Get certifications to validate your skills",
-        "Participate in hackathons and coding competitions",
-        "Leverage LinkedIn to connect with professionals",
-        "Consider starting with smaller companies for experience",
-        "Remote opportunities have opened more doors",
-    ],
+    'resume': {
+        'keywords': ['resume', 'cv', 'curriculum'],
+        'tips': [
+            "Keep your resume concise - ideally 1-2 pages",
+            "Use action verbs like 'developed', 'implemented', 'achieved'",
+            "Quantify your achievements with numbers where possible",
+            "Tailor your resume to each job description",
+            "Include relevant projects and internships",
+            "Use a clean, professional format",
+            "Proofread multiple times for errors",
+            "Include your technical skills prominently",
+        ],
+    },
+    'interview': {
+        'keywords': ['interview', 'interviewing', 'question'],
+        'tips': [
+            "Research the company thoroughly before the interview",
+            "Practice common interview questions out loud",
+            "Prepare examples using the STAR method (Situation, Task, Action, Result)",
+            "Ask thoughtful questions to the interviewer",
+            "Dress professionally even for video interviews",
+            "Test your technology beforehand for remote interviews",
+            "Be authentic and honest about your skills",
+            "Follow up with a thank you email within 24 hours",
+        ],
+    },
+    'skills': {
+        'keywords': ['skill', 'learn', 'technology', 'programming', 'coding'],
+        'tips': [
+            "Focus on in-demand skills like Python, JavaScript, React, Node.js",
+            "Build personal projects to demonstrate your skills",
+            "Contribute to open-source projects",
+            "Practice coding problems on platforms like LeetCode",
+            "Learn cloud platforms like AWS or Azure",
+            "Understand database fundamentals",
+            "Develop soft skills like communication and teamwork",
+            "Stay updated with industry trends",
+        ],
+    },
+    'internship': {
+        'keywords': ['internship', 'apply', 'application', 'job'],
+        'tips': [
+            "Start applying early - 2-3 months before you want to start",
+            "Apply to 10-15 internships for best results",
+            "Network with alumni and professionals",
+            "Attend career fairs and company events",
+            "Use your college career center resources",
+            "Follow up on applications after 1-2 weeks",
+            "Don't get discouraged by rejections",
+            "Learn from each interview experience",
+        ],
+    },
+    'tier23': {
+        'keywords': ['tier', 'college', 'location', 'college tier'],
+        'tips': [
+            "Your skills matter more than your college tier",
+            "Many companies actively seek diverse talent from all colleges",
+            "Build a strong portfolio of projects",
+            "Get certifications to validate your skills",
+            "Participate in hackathons and coding competitions",
+            "Leverage LinkedIn to connect with professionals",
+            "Consider starting with smaller companies for experience",
+            "Remote opportunities have opened more doors",
+        ],
+    },
 }
 
+# Optional JSON file with the same shape as CHAT_KNOWLEDGE, replacing it when set
+app.config['CHAT_KNOWLEDGE_FILE'] = os.environ.get('CHAT_KNOWLEDGE_FILE')
+
+app.config['CHAT_RESPONSE_CACHE_SIZE'] = 4096
+
+CHAT_TIPS_PER_RESPONSE = 3
+# Dropped before classification and response caching, unless a keyword uses them
+CHAT_STOP_WORDS = frozenset(
+    'a an the i im me my we you your it this that to for of on in at with about and or '
+    'is are am be do does can could should would will how what which when where why '
+    'please some any get give tell need want help tips advice hi hello hey'.split()
+)
+# An unclassified message containing one of these continues the previous topic
+CHAT_FOLLOW_UP_WORDS = frozenset('more else another other again continue also elaborate expand details'.split())
+# Checked in order and applied until none matches, so stacked suffixes
+# ('meetings' -> 'meeting' -> 'meet') collapse onto the same stem as each form
+STEM_RULES = (('ies', 'y'), ('ied', 'y'), ('ing', ''), ('ed', ''), ('s', ''))
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Strip common English suffixes so 'skills', 'applying' and 'skill', 'apply' match"""
+    while True:
+        for suffix, replacement in STEM_RULES:
+            if token.endswith(suffix) and not token.endswith('ss') and len(token) - len(suffix) >= 2:
+                token = token[:-len(suffix)] + replacement
+                break
+        else:
+            return token
+
+def tokenize(text):
+    """Lowercase word tokens, stemmed"""
+    return [stem(token) for token in re.findall(r'[a-z0-9]+', text.lower())]
+
+class IntentIndex:
+    """Compiled keyword index over a chat knowledge base
+
+    Every keyword (a single word or a phrase) is stemmed and inserted into a
+    token trie once, so classifying a message is a single left-to-right walk
+    whose cost depends on the message length, not on the number of intents.
+    Each matched keyword adds its token count to its intents' scores; the
+    best score wins and ties go to the intent listed first.
+    """
+
+    def __init__(self, knowledge):
+        self.knowledge = knowledge
+        self._priority = {intent: position for position, intent in enumerate(knowledge)}
+        self._trie = {}
+        keyword_tokens = set()
+        for intent, entry in knowledge.items():
+            for keyword in entry['keywords']:
+                tokens = tokenize(keyword)
+                if not tokens:
+                    continue
+                keyword_tokens.update(tokens)
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(None, {})[intent] = len(tokens)
+        self._stop_words = frozenset(stem(word) for word in CHAT_STOP_WORDS) - keyword_tokens
+
+    def normalize(self, message):
+        """Reduce a message to its stemmed, lowercase, stop-word-free tokens"""
+        return tuple(token for token in tokenize(message) if token not in self._stop_words)
+
+    def classify(self, message):
+        """Return the best-matching intent for a message, or None"""
+        return self.classify_tokens(tokenize(message))
+
+    def classify_tokens(self, tokens):
+        """Return the best-matching intent for already stemmed tokens, or None"""
+        scores = {}
+        for start in range(len(tokens)):
+            node = self._trie
+            for position in range(start, len(tokens)):
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                matches = node.get(None)
+                if matches:
+                    for intent, weight in matches.items():
+                        scores[intent] = scores.get(intent, 0) + weight
+        if not scores:
+            return None
+        return min(scores, key=lambda intent: (-scores[intent], self._priority[intent]))
+
+    def tips(self, intent):
+        """Return the tips for an intent"""
+        return self.knowledge[intent]['tips']
+
+def load_chat_knowledge(path=None):
+    """(Re)build the intent index from a JSON knowledge file, or the built-in CHAT_KNOWLEDGE"""
+    global chat_index
+    knowledge = CHAT_KNOWLEDGE
+    if path:
+        with open(path, encoding='utf-8') as f:
+            knowledge = json.load(f)
+    chat_index = IntentIndex(knowledge)
+    chat_response_cache.clear()
+    return chat_index
+
+chat_response_cache = LRUCache(app.config['CHAT_RESPONSE_CACHE_SIZE'])
+
+chat_index = load_chat_knowledge(app.config['CHAT_KNOWLEDGE_FILE'])
+
 def get_chatbot_response(message, history):
     """Get response from AI chatbot based on local knowledge base"""
-    message_lower = message.lower()
-
-    # Determine relevant context
-    context = None
-    if any(word in message_lower for word in ['resume', 'cv', 'curriculum']):
-        context = 'resume'
-    elif any(word in message_lower for word in ['interview', 'interviewing', 'question']):
-        context = 'interview'
-    elif any(word in message_lower for word in ['skill', 'learn', 'technology', 'programming', 'coding']):
-        context = 'skills'
-    elif any(word in message_lower for word in ['internship', 'apply', 'application', 'job']):
-        context = 'internship'
-    elif any(word in message_lower for word in ['tier', 'college', 'location', 'college tier']):
-        context = 'tier23'
+    # Rephrasings of the same question share one cached response
+    index = chat_index
+    tokens = index.normalize(message)
+    cached = chat_response_cache.get(tokens)
+    if cached is None:
+        context = index.classify_tokens(tokens)
+        cached = (context, build_chatbot_response(index, context))
+        # Don't let a reply from a just-replaced knowledge base outlive the reload
+        if index is chat_index:
+            chat_response_cache.set(tokens, cached)
+    context, response = cached
+
+    # Follow-ups like "tell me more" continue the topic of the last question that had one
+    if context is None and CHAT_FOLLOW_UP_WORDS.intersection(re.findall(r'[a-z]+', message.lower())):
+        for previous in reversed(history):
+            if previous['is_user']:
+                context = index.classify_tokens(index.normalize(previous['message']))
+                if context:
+                    return build_chatbot_response(index, context, follow_up=True)
+    return response
 
+def build_chatbot_response(index, context, follow_up=False):
+    """Render the reply for a classified intent, or the help text for None"""
     # Build response based on context
-    if context:
-        tips = CHAT_KNOWLEDGE[context]
-        selected_tips = tips[:3] if len(tips) > 3 else tips
+    if context and follow_up:
+        tips = index.tips(context)
+        selected_tips = tips[CHAT_TIPS_PER_RESPONSE:2 * CHAT_TIPS_PER_RESPONSE] or tips[:CHAT_TIPS_PER_RESPONSE]
+        response = f"Here is more on {context}:\n\n"
+        response += "\n".join(f"• {tip}" for tip in selected_tips)
+        response += "\n\nIs there anything specific you'd like to know more about?"
+    elif context:
+        selected_tips = index.tips(context)[:CHAT_TIPS_PER_RESPONSE]
         response = f"Based on your question about {context}, here are some tips:\n\n"
         response += "\n".join(f"• {tip}" for tip in selected_tips)
         response += "\n\nIs there anything specific you'd like to know more about?"
@@ -354,6 +2445,185 @@ def get_chatbot_response(message, history):
 
     return response
 
+def stream_chatbot_response(message, history):
+    """Yield the chatbot reply in word-sized pieces as it becomes available"""
+    # The local knowledge base answers instantly; a generative engine would yield its tokens here
+    yield from re.findall(r'\s*\S+', get_chatbot_response(message, history))
+
+def sse_event(data, event=None):
+    """Format one Server-Sent Events message with a JSON payload"""
+    prefix = f"event: {event}\n" if event else ''
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+# =============================================================================
+# STATIC ASSETS
+# =============================================================================
+
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+@lru_cache(maxsize=None)
+def static_fingerprint(filename):
+    """Content hash of a file in the static folder"""
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def static_url(filename):
+    """URL of a static file, versioned by its content so it can be cached forever"""
+    return url_for('static', filename=filename, v=static_fingerprint(filename))
+
+app.jinja_env.globals['static_url'] = static_url
+
+@app.after_request
+def cache_static_assets(response):
+    """Mark fingerprinted assets, and vendored ones whose paths carry a version, as immutable"""
+    if request.endpoint == 'static' and response.status_code in (200, 304):
+        filename = request.view_args['filename']
+        if filename.startswith('vendor/') or request.args.get('v') == static_fingerprint(filename):
+            response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    return response
+
+# =============================================================================
+# COMPRESSION
+# =============================================================================
+
+app.config['COMPRESS_MIN_SIZE'] = 512
+app.config['COMPRESS_GZIP_LEVEL'] = 6
+app.config['COMPRESS_BROTLI_QUALITY'] = 5
+
+# text/event-stream is left out: chat events are a few bytes each and a per-event flush would outweigh them
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'image/svg+xml', 'font/ttf',
+}
+# Preferred first; brotli only when the module is installed
+COMPRESS_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+STATIC_VARIANTS = {'br': '.br', 'gzip': '.gz'}
+
+def negotiate_encoding():
+    """Best content coding the client accepts, or None"""
+    for encoding in COMPRESS_ENCODINGS:
+        if request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+class StreamCompressor:
+    """Incremental gzip or brotli encoder with a common interface"""
+
+    def __init__(self, encoding, level=None):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=level or app.config['COMPRESS_BROTLI_QUALITY'])
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(level or app.config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self._brotli:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self):
+        """Emit everything buffered so far, so a streamed chunk reaches the client now"""
+        if self._brotli:
+            return self._brotli.flush()
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self._brotli:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+def compress_stream(chunks, compressor):
+    """Compress a streamed body chunk by chunk, closing the original iterable when done"""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+@app.after_request
+def compress_response(response):
+    """Gzip or brotli-encode compressible bodies the client can decode"""
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    # Files are precompressed at deploy time (flask compress-static)
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers or response.direct_passthrough):
+        return response
+    if response.content_length is not None and response.content_length < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    compressor = StreamCompressor(encoding)
+    if response.is_streamed:
+        response.response = compress_stream(response.response, compressor)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compressor.compress(data) + compressor.finish())
+    response.headers['Content-Encoding'] = encoding
+    # Byte-exact validators no longer hold once the body is re-encoded
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def send_static_asset(filename):
+    """Serve a static file, preferring an up-to-date precompressed variant the client accepts"""
+    encoding = negotiate_encoding()
+    if encoding and mimetypes.guess_type(filename)[0] in COMPRESSIBLE_TYPES:
+        source = safe_join(app.static_folder, filename)
+        variant = filename + STATIC_VARIANTS[encoding]
+        path = safe_join(app.static_folder, variant)
+        if (source and path and os.path.isfile(path) and os.path.isfile(source)
+                and os.path.getmtime(path) >= os.path.getmtime(source)):
+            # send_file derives Content-Type and Content-Encoding from the double extension
+            return send_from_directory(app.static_folder, variant, max_age=app.get_send_file_max_age(filename))
+    return app.send_static_file(filename)
+
+app.view_functions['static'] = send_static_asset
+
+def precompress_static(force=False):
+    """Write .gz and .br variants beside compressible static files; returns (file, sizes) pairs"""
+    results = []
+    for root, _, names in os.walk(app.static_folder):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if name.endswith(tuple(STATIC_VARIANTS.values())) or mimetypes.guess_type(name)[0] not in COMPRESSIBLE_TYPES:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < app.config['COMPRESS_MIN_SIZE']:
+                continue
+            sizes = {'identity': len(data)}
+            for encoding in COMPRESS_ENCODINGS:
+                target = path + STATIC_VARIANTS[encoding]
+                if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    sizes[encoding] = os.path.getsize(target)
+                    continue
+                # Deploy-time work, so spend the maximum effort on it
+                compressor = StreamCompressor(encoding, level=11 if encoding == 'br' else 9)
+                encoded = compressor.compress(data) + compressor.finish()
+                if len(encoded) >= len(data):
+                    continue
+                with open(target + '.tmp', 'wb') as f:
+                    f.write(encoded)
+                os.replace(target + '.tmp', target)
+                sizes[encoding] = len(encoded)
+            results.append((os.path.relpath(path, app.static_folder), sizes))
+    return results
+
 # =============================================================================
 # HTML TEMPLATES
 # =============================================================================
@@ -365,301 +2635,9 @@ BASE_HTML = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>SkillConnect - Internship Matching Platform</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <style>
-        :root {
-            --primary: #8b5cf6;
-            --primary-dark: #7c3aed;
-            --secondary: #3b82f6;
-            --success: #10b981;
-            --warning: #f59e0b;
-            --danger: #ef4444;
-            --dark: #1f2937;
-            --light: #f9fafb;
-        }
-
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #f5f3ff 0%, #ffffff 50%, #eff6ff 100%);
-            min-height: 100vh;
-        }
-
-        .navbar {
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            padding: 1rem 0;
-            position: sticky;
-            top: 0;
-            z-index: 1000;
-        }
-
-        .navbar-brand {
-            font-size: 1.8rem;
-            font-weight: 700;
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-
-        .btn-primary {
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            border: none;
-            padding: 0.5rem 1.5rem;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
-
-        .btn-primary:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 15px rgba(139, 92, 246, 0.4);
-        }
-
-        .card {
-            border: none;
-            border-radius: 1rem;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.07);
-            transition: all 0.3s ease;
-            overflow: hidden;
-        }
-
-        .card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-        }
-
-        .card-header {
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            color: white;
-            border: none;
-        }
-
-        .badge {
-            padding: 0.35rem 0.75rem;
-            border-radius: 0.5rem;
-            font-weight: 500;
-        }
-
-        .badge-primary { background: var(--primary); color: white; }
-        .badge-secondary { background: var(--secondary); color: white; }
-        .badge-success { background: var(--success); color: white; }
-        .badge-outline { border: 2px solid var(--primary); color: var(--primary); }
-
-        .hero-section {
-            padding: 4rem 1rem;
-            text-align: center;
-        }
-
-        .hero-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin-bottom: 1rem;
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 50%, #8b5cf6 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-
-        .feature-card {
-            padding: 2rem;
-            text-align: center;
-            height: 100%;
-        }
-
-        .feature-icon {
-            font-size: 3rem;
-            margin-bottom: 1rem;
-            color: var(--primary);
-        }
-
-        .internship-card {
-            border: 2px solid #e5e7eb;
-        }
-
-        .internship-card:hover {
-            border-color: var(--primary);
-        }
-
-        .skill-badge {
-            background: #f3f4f6;
-            color: #4b5563;
-            padding: 0.25rem 0.75rem;
-            border-radius: 1rem;
-            font-size: 0.875rem;
-            margin: 0.25rem;
-            display: inline-block;
-        }
-
-        .stat-card {
-            padding: 1.5rem;
-            text-align: center;
-            border-radius: 1rem;
-            background: white;
-            border: 2px solid #e5e7eb;
-        }
-
-        .stat-value {
-            font-size: 2.5rem;
-            font-weight: 700;
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-
-/* Chatbot Styles */
-        .chatbot-toggle {
-            position: fixed;
-            bottom: 2rem;
-            right: 2rem;
-            width: 3.5rem;
-            height: 3.5rem;
-            border-radius: 50%;
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            color: white;
-            border: none;
-            cursor: pointer;
-            box-shadow: 0 4px 15px rgba(139, 92, 246, 0.4);
-            z-index: 1001;
-            font-size: 1.5rem;
-            transition: all 0.3s ease;
-        }
-
-        .chatbot-toggle:hover {
-            transform: scale(1.1);
-        }
-
-        .chatbot-window {
-            position: fixed;
-            bottom: 7rem;
-            right: 2rem;
-            width: 400px;
-            height: 500px;
-            background: white;
-            border-radius: 1rem;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-            z-index: 1000;
-            display: none;
-            flex-direction: column;
-        }
-
-        .chatbot-window.active {
-            display: flex;
-        }
-
-        .chatbot-header {
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            color: white;
-            padding: 1rem;
-            border-radius: 1rem 1rem 0 0;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-
-        .chatbot-messages {
-            flex: 1;
-            overflow-y: auto;
-            padding: 1rem;
-            background: #f9fafb;
-        }
-
-        .chat-message {
-            margin-bottom: 1rem;
-            display: flex;
-        }
-
-        .chat-message.user {
-            justify-content: flex-end;
-        }
-
-        .chat-message.bot {
-            justify-content: flex-start;
-        }
-
-        .chat-bubble {
-            max-width: 80%;
-            padding: 0.75rem 1rem;
-            border-radius: 1rem;
-            font-size: 0.875rem;
-            line-height: 1.5;
-        }
-
-        .chat-message.user .chat-bubble {
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            color: white;
-            border-radius: 1rem 0 1rem 1rem;
-        }
-
-        .chat-message.bot .chat-bubble {
-            background: #e5e7eb;
-            color: #1f2937;
-            border-radius: 0 1rem 1rem 1rem;
-        }
-
-        .chatbot-input {
-            padding: 1rem;
-            border-top: 1px solid #e5e7eb;
-            display: flex;
-            gap: 0.5rem;
-        }
-
-        .chatbot-input input {
-            flex: 1;
-            border: 1px solid #e5e7eb;
-            border-radius: 0.5rem;
-            padding: 0.5rem 1rem;
-            outline: none;
-        }
-
-        .chatbot-input input:focus {
-            border-color: var(--primary);
-        }
-
-        .chatbot-input button {
-            background: linear-gradient(135deg, #8b5cf6 0%, #3b82f6 100%);
-            color: white;
-            border: none;
-            padding: 0.5rem 1.5rem;
-            border-radius: 0.5rem;
-            cursor: pointer;
-        }
-
-        footer {
-            background: #1f2937;
-            color: white;
-            padding: 3rem 1rem;
-            text-align: center;
-        }
-
-        @media (max-width: 768px) {
-            .hero-title { font-size: 1.8rem; }
-            .chatbot-window { width: 90%; right: 5%; }
-        }
-
-        .loading-spinner {
-            border: 3px solid #f3f4f6;
-            border-top: 3px solid var(--primary);
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 20px auto;
-        }
-
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-    </style>
+    <link href="{{ static_url('vendor/bootstrap-5.3.0/bootstrap.min.css') }}" rel="stylesheet">
+    <link href="{{ static_url('vendor/fontawesome-6.4.0/css/all.min.css') }}" rel="stylesheet">
+    <link href="{{ static_url('css/app.css') }}" rel="stylesheet">
 </head>
 <body>
     <!-- Navigation -->
@@ -671,6 +2649,9 @@ BASE_HTML = '''
                 </a>
                 {% if session.get('user_id') %}
                     <div class="d-flex align-items-center gap-3">
+                        {% if session.get('role') == 'RECRUITER' %}
+                        <a href="/analytics" class="nav-link text-dark fw-bold">Analytics</a>
+                        {% endif %}
                         <a href="/profile" class="nav-link text-dark fw-bold">My Profile</a>
                         <span class="badge badge-secondary">{{ session.get('role') }}</span>
                         <a href="/logout" class="btn btn-outline-dark btn-sm">Logout</a>
@@ -721,91 +2702,14 @@ BASE_HTML = '''
         </div>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        function toggleChatbot() {
-            const chatbot = document.getElementById('chatbotWindow');
-            chatbot.classList.toggle('active');
-        }
-
-        function handleChatKeyPress(event) {
-            if (event.key === 'Enter') {
-                sendMessage();
-            }
-        }
-
-        async function sendMessage() {
-            const input = document.getElementById('chatInput');
-            const message = input.value.trim();
-            if (!message) return;
-
-            const messagesDiv = document.getElementById('chatMessages');
-
-            // Add user message
-            const userMsg = document.createElement('div');
-            userMsg.className = 'chat-message user';
-            userMsg.innerHTML = `<div class="chat-bubble">${message}</div>`;
-            messagesDiv.appendChild(userMsg);
-
-            input.value = '';
-
-            // Show loading
-            const loadingMsg = document.createElement('div');
-            loadingMsg.className = 'chat-message bot';
-            loadingMsg.id = 'loadingMsg';
-            loadingMsg.innerHTML = `<div class="chat-bubble"><div class="loading-spinner"></div></div>`;
-            messagesDiv.appendChild(loadingMsg);
-            messagesDiv.scrollTop = messagesDiv.scrollHeight;
-
-            try {
-                const response = await fetch('/api/chat', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ message: message })
-                });
-
-                const data = await response.json();
-
-                // Remove loading and add bot response
-                document.getElementById('loadingMsg').remove();
-                const botMsg = document.createElement('div');
-                botMsg.className = 'chat-message bot';
-                botMsg.innerHTML = `<div class="chat-bubble" style="white-space: pre-line;">${data.response}</div>`;
-                messagesDiv.appendChild(botMsg);
-                messagesDiv.scrollTop = messagesDiv.scrollHeight;
-
-            } catch (error) {
-                document.getElementById('loadingMsg').remove();
-                const errorMsg = document.createElement('div');
-                errorMsg.className = 'chat-message bot';
-                errorMsg.innerHTML = `<div class="chat-bubble">Sorry, I encountered an error. Please try again.</div>`;
-                messagesDiv.appendChild(errorMsg);
-            }
-        }
-
-        function applyToInternship(internshipId) {
-            fetch('/api/apply', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ internship_id: internshipId })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    alert('Application submitted successfully!');
-                    location.reload();
-                } else {
-                    alert(data.error || 'Failed to apply');
-                }
-            })
-            .catch(error => alert('Something went wrong'));
-        }
-    </script>
+    <script src="{{ static_url('vendor/bootstrap-5.3.0/bootstrap.min.js') }}"></script>
+    <script src="{{ static_url('js/app.js') }}"></script>
 </body>
 </html>
 '''
 
-HOME_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
+HOME_TEMPLATE = '''{% extends 'base.html' %}
+{% block content %}
     <section class="hero-section">
         <div class="container">
             <span class="badge badge-secondary mb-3">🎓 Bridging Education & Industry</span>
@@ -984,23 +2888,12 @@ HOME_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
         </div>
     </section>
 
-    <script>
-        function toggleStudentFields(role) {
-            const studentFields = document.getElementById('studentFields');
-            studentFields.style.display = role === 'STUDENT' ? 'block' : 'none';
-        }
-
-        // Initialize student fields visibility
-        document.addEventListener('DOMContentLoaded', function() {
-            const roleSelect = document.querySelector('select[name="role"]');
-            if (roleSelect) {
-                toggleStudentFields(roleSelect.value);
-            }
-        });
-  </script>
-''')
-
-DASHBOARD_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
+    <script src="{{ static_url('js/home.js') }}"></script>
+{% endblock %}
+'''
+
+DASHBOARD_TEMPLATE = '''{% extends 'base.html' %}
+{% block content %}
     <section class="py-5">
         <div class="container">
             <h1 class="mb-2">Welcome back, {{ user.name }}! 👋</h1>
@@ -1044,6 +2937,34 @@ DASHBOARD_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
                 </div>
             </div>
 
+            {% if recommended %}
+            <!-- Recommendations -->
+            <h2 class="mb-4">Recommended for You</h2>
+            <div class="row g-4 mb-5">
+                {% for internship in recommended %}
+                <div class="col-md-4">
+                    <div class="card h-100 internship-card">
+                        <div class="card-body">
+                            <div class="d-flex justify-content-between align-items-start mb-2">
+                                <h5 class="mb-1">{{ internship.title }}</h5>
+                                <span class="badge badge-success">{{ (internship.match_score * 100)|round|int }}% match</span>
+                            </div>
+                            <p class="text-muted mb-3"><strong>{{ internship.company_name }}</strong> • {{ internship.location }}</p>
+                            <div class="mb-3">
+                                {% for skill in internship.matched_skills %}
+                                    <span class="skill-badge">{{ skill }}</span>
+                                {% endfor %}
+                            </div>
+                            <button class="btn btn-primary" onclick="applyToInternship('{{ internship.id }}')">
+                                Apply Now <i class="fas fa-arrow-right ms-2"></i>
+                            </button>
+                        </div>
+                    </div>
+                </div>
+                {% endfor %}
+            </div>
+            {% endif %}
+
             <!-- Search and Filters -->
             <div class="card mb-4 border-2">
                 <div class="card-header">
@@ -1053,7 +2974,7 @@ DASHBOARD_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
                     <div class="row g-3">
                         <div class="col-md-5">
                             <label class="form-label">Search</label>
-                            <input type="text" id="searchInput" class="form-control" placeholder="Search by title or description..." oninput="filterInternships()">
+                            <input type="text" id="searchInput" class="form-control" placeholder="Search by title, company or skill..." oninput="filterInternships()">
                         </div>
                         <div class="col-md-3">
                             <label class="form-label">Type</label>
@@ -1083,7 +3004,7 @@ DASHBOARD_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
             <div id="internshipList">
                 {% if internships %}
                     {% for internship in internships %}
-                    <div class="card mb-3 internship-card" data-title="{{ internship.title|lower }}" data-description="{{ internship.description|lower }}" data-type="{{ internship.type }}" data-location="{{ internship.location }}">
+                    <div class="card mb-3 internship-card">
                         <div class="card-body">
                             <div class="d-flex justify-content-between align-items-start mb-3">
                                 <div>
@@ -1123,78 +3044,23 @@ DASHBOARD_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
                     </div>
                 {% endif %}
             </div>
+            <div id="listSentinel" class="text-center">
+                {% if next_cursor %}<div class="loading-spinner"></div>{% endif %}
+            </div>
         </div>
     </section>
 
     <script>
-        const internshipsData = {{ internships|tojson }};
-        let filteredInternships = internshipsData;
-
-        function filterInternships() {
-            const search = document.getElementById('searchInput').value.toLowerCase();
-            const type = document.getElementById('typeFilter').value;
-            const location = document.getElementById('locationFilter').value;
-
-            filteredInternships = internshipsData.filter(internship => {
-                const matchesSearch = !search ||
-                    internship.title.toLowerCase().includes(search) ||
-                    internship.description.toLowerCase().includes(search);
-                const matchesType = type === 'all' || internship.type === type;
-                const matchesLocation = location === 'all' || internship.location === location;
-
-                return matchesSearch && matchesType && matchesLocation;
-            });
-
-            renderInternships();
-        }
-
-        function renderInternships() {
-            const container = document.getElementById('internshipList');
-
-            if (filteredInternships.length === 0) {
-                container.innerHTML = `
-                    <div class="card text-center py-5">
-                        <i class="fas fa-briefcase fa-4x text-muted mb-3"></i>
-                        <p class="text-muted">No internships found matching your criteria.</p>
-                    </div>
-                `;
-                return;
-            }
-
-            container.innerHTML = filteredInternships.map(internship => `
-                <div class="card mb-3 internship-card">
-                    <div class="card-body">
-                        <div class="d-flex justify-content-between align-items-start mb-3">
-                            <div>
-                                <h5 class="mb-1">${internship.title}</h5>
-                                <p class="text-muted mb-0"><strong>${internship.company_name}</strong></p>
-                            </div>
-                            <span class="badge badge-primary">${internship.type}</span>
-                        </div>
-                        <p class="text-muted mb-3">${internship.description.substring(0, 200)}...</p>
-                        <div class="d-flex flex-wrap gap-4 mb-3">
-                            <span class="text-muted small"><i class="fas fa-map-marker-alt me-1"></i>${internship.location}</span>
-                            <span class="text-muted small"><i class="fas fa-clock me-1"></i>${internship.duration} months</span>
-                            ${internship.stipend ? `<span class="text-muted small"><i class="fas fa-rupee-sign me-1"></i>${internship.stipend} /month</span>` : ''}
-                        </div>
-                        <div class="mb-3">
-                            ${internship.skills.map(skill => `<span class="skill-badge">${skill.name}</span>`).join('')}
-                        </div>
-                        <div class="d-flex justify-content-between align-items-center">
-                            <span class="text-muted small">${internship.applications} applicants</span>
-                            <button class="btn btn-primary" onclick="applyToInternship('${internship.id}')">
-                                Apply Now <i class="fas fa-arrow-right ms-2"></i>
-                            </button>
-                        </div>
-                    </div>
-                </div>
-            `).join('');
-        }
+        const isStudent = {{ (user.role == 'STUDENT')|tojson }};
+        let nextCursor = {{ next_cursor|tojson }};
     </script>
-''')
+    <script src="{{ static_url('js/dashboard.js') }}"></script>
+{% endblock %}
+'''
 
 # PROFILE TEMPLATE ADDED HERE
-PROFILE_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
+PROFILE_TEMPLATE = '''{% extends 'base.html' %}
+{% block content %}
     <section class="py-5">
         <div class="container">
             <div class="d-flex justify-content-between align-items-center mb-4">
@@ -1304,7 +3170,148 @@ PROFILE_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
             </div>
         </div>
     </section>
-''')
+{% endblock %}
+'''
+
+ANALYTICS_TEMPLATE = '''{% extends 'base.html' %}
+{% block content %}
+    <section class="py-5">
+        <div class="container">
+            <div class="d-flex justify-content-between align-items-center mb-4">
+                <h1>Posting Analytics</h1>
+                <div class="d-flex gap-2">
+                    <a href="/api/applications/export?format=csv" class="btn btn-outline-primary">
+                        <i class="fas fa-download me-2"></i>Export CSV
+                    </a>
+                    <a href="/dashboard" class="btn btn-outline-primary">
+                        <i class="fas fa-arrow-left me-2"></i>Back to Dashboard
+                    </a>
+                </div>
+            </div>
+
+            <div class="row g-4 mb-4">
+                {% for label, value in [('Postings', analytics.totals.postings), ('Active', analytics.totals.active),
+                                        ('Applications', analytics.totals.applications), ('Views', analytics.totals.views)] %}
+                <div class="col-6 col-md-3">
+                    <div class="stat-card">
+                        <div class="stat-value">{{ value }}</div>
+                        <div class="text-muted">{{ label }}</div>
+                    </div>
+                </div>
+                {% endfor %}
+            </div>
+
+            <div class="row g-4 mb-4">
+                <div class="col-lg-6">
+                    <div class="card shadow-sm h-100">
+                        <div class="card-header bg-white">
+                            <h5 class="mb-0"><i class="fas fa-university me-2"></i>Applicants by College Tier</h5>
+                        </div>
+                        <div class="card-body">
+                            {% set tier_total = analytics.tiers.values()|sum %}
+                            {% for tier, count in analytics.tiers.items() %}
+                            <div class="d-flex justify-content-between"><span>{{ tier|replace('_', ' ')|title }}</span><strong>{{ count }}</strong></div>
+                            <div class="progress mb-3" style="height: 6px;">
+                                <div class="progress-bar" style="width: {{ (100 * count / tier_total)|round(1) if tier_total else 0 }}%"></div>
+                            </div>
+                            {% else %}
+                            <p class="text-muted mb-0">No applications yet.</p>
+                            {% endfor %}
+                        </div>
+                    </div>
+                </div>
+                <div class="col-lg-6">
+                    <div class="card shadow-sm h-100">
+                        <div class="card-header bg-white">
+                            <h5 class="mb-0"><i class="fas fa-tasks me-2"></i>Applications by Status</h5>
+                        </div>
+                        <div class="card-body">
+                            {% set status_total = analytics.statuses.values()|sum %}
+                            {% for status, count in analytics.statuses.items() %}
+                            <div class="d-flex justify-content-between"><span>{{ status|title }}</span><strong>{{ count }}</strong></div>
+                            <div class="progress mb-3" style="height: 6px;">
+                                <div class="progress-bar" style="width: {{ (100 * count / status_total)|round(1) if status_total else 0 }}%"></div>
+                            </div>
+                            {% else %}
+                            <p class="text-muted mb-0">No applications yet.</p>
+                            {% endfor %}
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="card shadow-sm mb-4">
+                <div class="card-header bg-white">
+                    <h5 class="mb-0"><i class="fas fa-chart-bar me-2"></i>Last {{ analytics.daily|length }} Days</h5>
+                </div>
+                <div class="card-body">
+                    {% set peak = analytics.daily|map(attribute='applications')|max or 1 %}
+                    <div class="d-flex align-items-end gap-1" style="height: 120px;">
+                        {% for day in analytics.daily %}
+                        <div class="flex-fill rounded-top" style="background: var(--primary); min-height: 2px; height: {{ (100 * day.applications / peak)|round(1) }}%;"
+                             title="{{ day.day }}: {{ day.applications }} applications, {{ day.views }} views"></div>
+                        {% endfor %}
+                    </div>
+                    <div class="d-flex justify-content-between text-muted small mt-2">
+                        <span>{{ analytics.daily[0].day }}</span><span>{{ analytics.daily[-1].day }}</span>
+                    </div>
+                </div>
+            </div>
+
+            <div class="card shadow-sm">
+                <div class="card-header bg-white">
+                    <h5 class="mb-0"><i class="fas fa-briefcase me-2"></i>Postings</h5>
+                </div>
+                <div class="card-body">
+                    {% if analytics.postings %}
+                    <div class="table-responsive">
+                        <table class="table table-hover align-middle">
+                            <thead class="table-light">
+                                <tr>
+                                    <th>Posting</th>
+                                    <th class="text-end">Views</th>
+                                    <th class="text-end">Applications</th>
+                                    {% for tier in tiers %}<th class="text-end">{{ tier|replace('_', ' ')|title }}</th>{% endfor %}
+                                    <th class="text-end">Accepted</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {% for posting in analytics.postings %}
+                                <tr>
+                                    <td>
+                                        <div class="fw-bold">{{ posting.title }}</div>
+                                        <small class="text-muted">{{ posting.company_name or '' }}{% if posting.status != 'ACTIVE' %} &middot; {{ posting.status|title }}{% endif %}</small>
+                                    </td>
+                                    <td class="text-end">{{ posting.views }}</td>
+                                    <td class="text-end">{{ posting.application_count }}</td>
+                                    {% for tier in tiers %}<td class="text-end">{{ posting.tiers[tier] }}</td>{% endfor %}
+                                    <td class="text-end">{{ posting.statuses['ACCEPTED'] }}</td>
+                                </tr>
+                                {% endfor %}
+                            </tbody>
+                        </table>
+                    </div>
+                    {% else %}
+                    <p class="text-muted mb-0">You have not posted any internships yet.</p>
+                    {% endif %}
+                </div>
+            </div>
+        </div>
+    </section>
+{% endblock %}
+'''
+
+# Registered as named templates so each worker parses and compiles them once
+# and Jinja's template cache serves every later render
+app.jinja_loader = DictLoader({
+    'base.html': BASE_HTML,
+    'home.html': HOME_TEMPLATE,
+    'dashboard.html': DASHBOARD_TEMPLATE,
+    'profile.html': PROFILE_TEMPLATE,
+    'analytics.html': ANALYTICS_TEMPLATE,
+})
+for template_name in app.jinja_loader.list_templates():
+    app.jinja_env.get_template(template_name)
 
 # =============================================================================
 # ROUTES
@@ -1313,7 +3320,7 @@ PROFILE_TEMPLATE = BASE_HTML.replace('{% block content %}{% endblock %}', '''
 @app.route('/')
 def home():
     """Home page with login/signup"""
-    return render_template_string(HOME_TEMPLATE)
+    return render_template('home.html')
 
 @app.route('/signup', methods=['POST'])
 def signup():
@@ -1335,7 +3342,7 @@ def signup():
 
         # Create user
         user_id = generate_id()
-        hashed_password = hash_password(password)
+        hashed_password = password_hasher.hash(password)
 
         if role == 'STUDENT':
             college_tier = request.form.get('college_tier')
@@ -1353,15 +3360,16 @@ def signup():
             ''', (user_id, email, hashed_password, name, role))
 
         conn.commit()
-        conn.close()
 
-        session['user_id'] = user_id
-        session['name'] = name
-        session['role'] = role
+        remember_user(get_user(conn, user_id))
 
         flash('Account created successfully! Welcome aboard.', 'success')
         return redirect(url_for('dashboard'))
 
+    except HasherBusy:
+        flash('We are handling a lot of sign-ins right now. Please try again in a moment.', 'error')
+        return redirect(url_for('home'))
+
     except Exception as e:
         flash(f'Error creating account: {str(e)}', 'error')
         return redirect(url_for('home'))
@@ -1378,24 +3386,31 @@ def login():
 
         cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
         user = cursor.fetchone()
-        conn.close()
 
         if not user:
             flash('Invalid credentials', 'error')
             return redirect(url_for('home'))
 
-        hashed_password = hash_password(password)
-        if user['password'] != hashed_password:
+        matches, needs_rehash = password_hasher.verify(password, user['password'])
+        if not matches:
             flash('Invalid credentials', 'error')
             return redirect(url_for('home'))
 
-        session['user_id'] = user['id']
-        session['name'] = user['name']
-        session['role'] = user['role']
+        # Upgrade legacy SHA-256 hashes and old scrypt costs transparently
+        if needs_rehash:
+            cursor.execute('UPDATE users SET password = ? WHERE id = ?',
+                           (password_hasher.hash(password), user['id']))
+            conn.commit()
+
+        remember_user(dict(user))
 
         flash('Welcome back! You are now logged in.', 'success')
         return redirect(url_for('dashboard'))
 
+    except HasherBusy:
+        flash('We are handling a lot of sign-ins right now. Please try again in a moment.', 'error')
+        return redirect(url_for('home'))
+
     except Exception as e:
         flash(f'Login error: {str(e)}', 'error')
         return redirect(url_for('home'))
@@ -1409,76 +3424,45 @@ def logout():
 
 @app.route('/dashboard')
 @login_required
+@conditional_on('internships', 'applicants', 'user')
 def dashboard():
     """User dashboard with internship listings"""
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # Get internships with company info
-    cursor.execute('''
-        SELECT i.*, c.name as company_name,
-               (SELECT COUNT(*) FROM applications a WHERE a.internship_id = i.id) as applications
-        FROM internships i
-        LEFT JOIN companies c ON i.company_id = c.id
-        WHERE i.status = 'ACTIVE'
-        ORDER BY i.created_at DESC
-    ''')
-    raw_rows = cursor.fetchall()
-
-    # Initialize list for final data
-    internships_list = []
-
-    for row in raw_rows:
-        # FIX: Convert read-only Row to dict so we can add 'skills' key
-        internship = dict(row)
+    # Only the first page is rendered; the rest is fetched from /api/internships on scroll
+    internships_list, next_cursor = fetch_internships_page(cursor)
 
-        # Get skills for this internship
-        cursor.execute('''
-            SELECT s.* FROM skills s
-            INNER JOIN internship_skills isk ON s.id = isk.skill_id
-            WHERE isk.internship_id = ?
-        ''', (internship['id'],))
-        
-        # Convert skills to dicts as well and attach to internship
-        internship['skills'] = [dict(skill) for skill in cursor.fetchall()]
-
-        # Increment views
-        cursor.execute('UPDATE internships SET views = views + 1 WHERE id = ?', (internship['id'],))
+    view_counter.record(internship['id'] for internship in internships_list)
 
-        # Add to list
-        internships_list.append(internship)
+    stats = dashboard_stats(conn)
 
-    conn.commit()
-    conn.close()
-
-    # Get stats
-    stats = {
-        'internships': len(internships_list),
-        'remote': len([i for i in internships_list if i['location'] == 'Remote']),
-        'skills': 12,
-        'companies': 3
-    }
+    user = current_user()
+    if user is None:
+        session.clear()
+        return redirect(url_for('home'))
 
-    # Get user info
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],))
-    user = dict(cursor.fetchone())
-    conn.close()
+    recommended = []
+    if user['role'] == 'STUDENT':
+        recommended = recommend_internships(conn, user['id'], DASHBOARD_RECOMMENDATIONS)
 
-    return render_template_string(DASHBOARD_TEMPLATE, user=user, internships=internships_list, stats=stats)
+    return render_template('dashboard.html', user=user, internships=internships_list,
+                           next_cursor=next_cursor, stats=stats, recommended=recommended)
 
 # PROFILE ROUTE ADDED HERE
 @app.route('/profile')
 @login_required
+@conditional_on('internships', 'user')
 def profile():
     """User profile page with application history"""
     conn = get_db_connection()
     cursor = conn.cursor()
 
     # Get user details
-    cursor.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],))
-    user = dict(cursor.fetchone())
+    user = get_user(conn, session['user_id'])
+    if user is None:
+        session.clear()
+        return redirect(url_for('home'))
 
     # Get application history with internship and company details
     cursor.execute('''
@@ -1493,9 +3477,208 @@ def profile():
     applications = [dict(row) for row in cursor.fetchall()]
     applied_count = len(applications)
 
-    conn.close()
+    return render_template('profile.html', user=user, applications=applications, applied_count=applied_count)
+
+@app.route('/api/internships')
+@login_required
+@conditional_on('internships', 'applicants')
+def list_internships():
+    """Paginated internship listing API"""
+    after = request.args.get('cursor')
+    if after:
+        try:
+            after = decode_cursor(after)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    limit = request.args.get('limit', INTERNSHIPS_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, INTERNSHIPS_MAX_PAGE_SIZE))
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    internships, next_cursor = fetch_internships_page(
+        cursor,
+        after=after,
+        limit=limit,
+        internship_type=request.args.get('type'),
+        location=request.args.get('location'),
+        search=request.args.get('search', '').strip(),
+    )
+
+    view_counter.record(internship['id'] for internship in internships)
+
+    return jsonify({'internships': internships, 'next_cursor': next_cursor})
+
+@app.route('/api/search')
+@login_required
+@conditional_on('internships', 'applicants')
+def search():
+    """Ranked full-text internship search API"""
+    limit = request.args.get('limit', SEARCH_RESULTS_LIMIT, type=int)
+    limit = max(1, min(limit, SEARCH_RESULTS_LIMIT))
+
+    conn = get_db_connection()
+    results = search_internships(
+        conn.cursor(),
+        request.args.get('q', ''),
+        limit=limit,
+        internship_type=request.args.get('type'),
+        location=request.args.get('location'),
+    )
+
+    view_counter.record(result['id'] for result in results)
+    return jsonify({'internships': results})
+
+@app.route('/api/recommendations')
+@login_required
+@conditional_on('internships', 'applicants', 'user')
+def recommendations():
+    """Top-k skill-matched internships for the logged-in student"""
+    if session.get('role') != 'STUDENT':
+        return jsonify({'error': 'Recommendations are only available to students'}), 403
+
+    k = request.args.get('k', RECOMMENDATIONS_DEFAULT_K, type=int)
+    k = max(1, min(k, RECOMMENDATIONS_MAX_K))
+
+    internships = recommend_internships(get_db_connection(), session['user_id'], k)
+    return jsonify({'internships': internships})
+
+@app.route('/api/profile', methods=['GET', 'POST'])
+@login_required
+@conditional_on('user')
+def profile_api():
+    """Read or update the logged-in user's profile fields"""
+    user_id = session['user_id']
+    conn = get_db_connection()
+
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        changes = {field: data[field] for field in PROFILE_EDITABLE_FIELDS if field in data}
+        invalid = [field for field, value in changes.items()
+                   if value is not None and (isinstance(value, bool) or not isinstance(value, (str, int, float)))]
+        if invalid:
+            return jsonify({'success': False, 'error': f"{', '.join(invalid)} must be a string, number or null"}), 400
+        if 'name' in changes and not str(changes['name'] or '').strip():
+            return jsonify({'success': False, 'error': 'Name cannot be empty'}), 400
+        if changes.get('year') not in (None, ''):
+            try:
+                changes['year'] = int(changes['year'])
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'Year must be a number'}), 400
+
+        if changes:
+            conn.execute(f"UPDATE users SET {', '.join(f'{field} = ?' for field in changes)} WHERE id = ?",
+                         (*changes.values(), user_id))
+            conn.commit()
+            invalidate_user(user_id)
+
+    user = get_user(conn, user_id)
+    if user is None:
+        return jsonify({'success': False, 'error': 'User not found'}), 404
+    if request.method == 'POST':
+        remember_user(user)
+    return jsonify({'success': True, 'user': user})
+
+@app.route('/api/profile/skills', methods=['GET', 'POST'])
+@login_required
+def student_skills():
+    """Read or replace the logged-in student's skills"""
+    if session.get('role') != 'STUDENT':
+        return jsonify({'error': 'Skills can only be set by students'}), 403
+
+    user_id = session['user_id']
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        items = body.get('skills') if isinstance(body, dict) else None
+        try:
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise TypeError('skills must be a list of objects')
+            skills = {item['skill_id']: int(item.get('proficiency', 1)) for item in items}
+            if not all(isinstance(skill_id, str) for skill_id in skills):
+                raise TypeError('skill_id must be a string')
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'Expected {"skills": [{"skill_id": ..., "proficiency": 1-5}]}'}), 400
+
+        cursor.execute('DELETE FROM student_skills WHERE user_id = ?', (user_id,))
+        cursor.executemany('''
+            INSERT INTO student_skills (id, user_id, skill_id, proficiency)
+            SELECT ?, ?, id, ? FROM skills WHERE id = ?
+        ''', [(generate_id(), user_id, min(max(proficiency, 1), MAX_PROFICIENCY), skill_id)
+              for skill_id, proficiency in skills.items()])
+        conn.commit()
+        recommendation_cache.invalidate_students(conn, [user_id])
+
+    cursor.execute('''
+        SELECT s.id, s.name, s.category, ss.proficiency FROM student_skills ss
+        JOIN skills s ON s.id = ss.skill_id
+        WHERE ss.user_id = ?
+        ORDER BY s.name
+    ''', (user_id,))
+    return jsonify({'skills': [dict(row) for row in cursor.fetchall()]})
+
+@app.route('/api/internships/<internship_id>/status', methods=['POST'])
+@login_required
+def update_internship_status(internship_id):
+    """Open or close one of the logged-in recruiter's postings"""
+    status = (request.json or {}).get('status')
+    if status not in INTERNSHIP_STATUSES:
+        return jsonify({'success': False, 'error': f"Status must be one of {', '.join(INTERNSHIP_STATUSES)}"}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE internships SET status = ? WHERE id = ? AND posted_by_id = ?
+    ''', (status, internship_id, session['user_id']))
+    conn.commit()
+
+    if cursor.rowcount == 0:
+        return jsonify({'success': False, 'error': 'Internship not found'}), 404
+
+    recommendation_cache.invalidate_internships(conn, [internship_id])
+    invalidate_dashboard_stats()
+    return jsonify({'success': True})
 
-    return render_template_string(PROFILE_TEMPLATE, user=user, applications=applications, applied_count=applied_count)
+@app.route('/api/applications/export')
+@login_required
+def export_applications_api():
+    """Stream every application to the logged-in recruiter's postings as CSV or JSON Lines"""
+    if session.get('role') != 'RECRUITER':
+        return jsonify({'error': 'Only recruiters can export applications'}), 403
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+    filename = f"applications-{datetime.now(timezone.utc):%Y%m%d}.{fmt}"
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    chunks = export_applications(get_db_connection(), fmt, session['user_id'])
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@app.route('/analytics')
+@login_required
+def analytics():
+    """Recruiter analytics: applicant volume per posting, college tier, status and day"""
+    if session.get('role') != 'RECRUITER':
+        flash('Analytics are available to recruiters only', 'error')
+        return redirect(url_for('dashboard'))
+
+    data = recruiter_analytics(get_db_connection(), session['user_id'])
+    tiers = [tier for tier in COLLEGE_TIERS if tier in data['tiers']]
+    return render_template('analytics.html', analytics=data, tiers=tiers)
+
+@app.route('/api/analytics')
+@login_required
+def analytics_api():
+    """Recruiter analytics as JSON"""
+    if session.get('role') != 'RECRUITER':
+        return jsonify({'error': 'Only recruiters can view analytics'}), 403
+    return jsonify(recruiter_analytics(get_db_connection(), session['user_id']))
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -1507,71 +3690,485 @@ def chat():
         if not message:
             return jsonify({'error': 'Message is required'}), 400
 
-        # Get response from chatbot
-        response = get_chatbot_response(message, [])
-
-        # Save to database if user is logged in
-        if 'user_id' in session:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Save user message
-            cursor.execute('''
-                INSERT INTO chat_messages (id, user_id, message, is_user)
-                VALUES (?, ?, ?, ?)
-            ''', (generate_id(), session['user_id'], message, 1))
+        asked_at = chat_timestamp()
+        user_id = session.get('user_id')
+        history = chat_context.get(get_db_connection(), user_id) if user_id else []
 
-            # Save bot response
-            cursor.execute('''
-                INSERT INTO chat_messages (id, user_id, message, is_user)
-                VALUES (?, ?, ?, ?)
-            ''', (generate_id(), session['user_id'], response, 0))
+        # Get response from chatbot
+        response = get_chatbot_response(message, history)
 
-            conn.commit()
-            conn.close()
+        # Queue both messages for the background writer if user is logged in
+        if user_id:
+            record_chat_exchange(user_id, message, asked_at, response)
 
         return jsonify({'response': response})
 
+    except ChatBacklogFull:
+        return jsonify({'error': 'Chat is busy right now, please try again'}), 503
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """AI Chatbot API streaming the reply as Server-Sent Events"""
+    message = (request.json or {}).get('message', '')
+    if not message:
+        return jsonify({'error': 'Message is required'}), 400
+
+    user_id = session.get('user_id')
+    asked_at = chat_timestamp()
+    history = chat_context.get(get_db_connection(), user_id) if user_id else []
+
+    def generate():
+        pieces = []
+        try:
+            for piece in stream_chatbot_response(message, history):
+                pieces.append(piece)
+                yield sse_event({'delta': piece})
+        except Exception as e:
+            yield sse_event({'error': str(e)}, event='error')
+            return
+
+        yield sse_event({}, event='done')
+
+        # Persist only after the client has the whole reply
+        if user_id:
+            try:
+                record_chat_exchange(user_id, message, asked_at, ''.join(pieces))
+            except ChatBacklogFull:
+                app.logger.warning('Chat write queue full, dropped streamed exchange for %s', user_id)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/chat/history')
+@login_required
+def chat_history():
+    """Paginated chat history API, newest first"""
+    after = request.args.get('cursor')
+    if after:
+        try:
+            after = decode_cursor(after)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    limit = request.args.get('limit', CHAT_HISTORY_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, CHAT_HISTORY_MAX_PAGE_SIZE))
+
+    query = 'SELECT id, message, is_user, created_at FROM chat_messages WHERE user_id = ?'
+    params = [session['user_id']]
+    if after:
+        query += ' AND (created_at, id) < (?, ?)'
+        params.extend(after)
+    query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    params.append(limit + 1)
+
+    rows = get_db_connection().execute(query, params).fetchall()
+    messages = [{**dict(row), 'is_user': bool(row['is_user'])} for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(messages[-1]['created_at'], messages[-1]['id'])
+
+    return jsonify({'messages': messages, 'next_cursor': next_cursor})
+
 @app.route('/api/apply', methods=['POST'])
 @login_required
 def apply():
     """Apply to an internship"""
     try:
-        data = request.json
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
         internship_id = data.get('internship_id')
-        user_id = session['user_id']
 
-        if not internship_id:
-            return jsonify({'success': False, 'error': 'Internship ID is required'})
+        if not internship_id or not isinstance(internship_id, str):
+            return jsonify({'success': False, 'error': 'Internship ID is required'}), 400
+        idempotency_key = request_idempotency_key(data)
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        outcome, application_id = apply_to_internships(
+            get_db_connection(), session['user_id'], [internship_id], idempotency_key)[internship_id]
+        if outcome == 'already_applied':
+            return jsonify({'success': False, 'error': 'You have already applied to this internship'}), 409
+        if outcome == 'unavailable':
+            return jsonify({'success': False, 'error': 'Internship not found or no longer accepting applications'}), 404
 
-        # Check if already applied
-        cursor.execute('''
-            SELECT id FROM applications WHERE user_id = ? AND internship_id = ?
-        ''', (user_id, internship_id))
+        return jsonify({'success': True, 'application_id': application_id})
 
-        if cursor.fetchone():
-            conn.close()
-            return jsonify({'success': False, 'error': 'You have already applied to this internship'})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        app.logger.exception('Apply failed')
+        return jsonify({'success': False, 'error': 'Could not submit the application, please try again'}), 500
 
-        # Create application
-        cursor.execute('''
-            INSERT INTO applications (id, user_id, internship_id, status)
-            VALUES (?, ?, ?, ?)
-        ''', (generate_id(), user_id, internship_id, 'PENDING'))
+@app.route('/api/apply/bulk', methods=['POST'])
+@login_required
+def apply_bulk():
+    """Apply to several internships in one transaction, with a result per internship"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        internship_ids = data.get('internship_ids')
+
+        if (not isinstance(internship_ids, list) or not internship_ids
+                or not all(isinstance(internship_id, str) and internship_id for internship_id in internship_ids)):
+            return jsonify({'success': False, 'error': 'internship_ids must be a non-empty list of IDs'}), 400
+        internship_ids = list(dict.fromkeys(internship_ids))
+        if len(internship_ids) > BULK_APPLY_MAX:
+            return jsonify({'success': False,
+                            'error': f'At most {BULK_APPLY_MAX} internships can be applied to at once'}), 400
+        idempotency_key = request_idempotency_key(data)
+
+        results = apply_to_internships(get_db_connection(), session['user_id'], internship_ids, idempotency_key)
+        items = [{'internship_id': internship_id, 'status': results[internship_id][0],
+                  'application_id': results[internship_id][1]} for internship_id in internship_ids]
+        applied = sum(item['status'] == 'applied' for item in items)
+
+        return jsonify({'success': True, 'applied': applied, 'results': items})
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        app.logger.exception('Bulk apply failed')
+        return jsonify({'success': False, 'error': 'Could not submit the applications, please try again'}), 500
+
+@app.route('/api/withdraw', methods=['POST'])
+@login_required
+def withdraw():
+    """Withdraw an application"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        internship_id = data.get('internship_id')
 
+        if not internship_id or not isinstance(internship_id, str):
+            return jsonify({'success': False, 'error': 'Internship ID is required'}), 400
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM applications WHERE user_id = ? AND internship_id = ?
+        ''', (session['user_id'], internship_id))
         conn.commit()
-        conn.close()
+
+        if cursor.rowcount == 0:
+            return jsonify({'success': False, 'error': 'You have not applied to this internship'}), 404
 
         return jsonify({'success': True})
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+    except Exception:
+        app.logger.exception('Withdraw failed')
+        return jsonify({'success': False, 'error': 'Could not withdraw the application, please try again'}), 500
+
+# =============================================================================
+# CLI COMMANDS
+# =============================================================================
+
+@app.cli.command('repair-counts')
+def repair_counts_command():
+    """Recompute denormalized applicant counts from the applications table"""
+    fixed = repair_application_counts(get_db_connection())
+    print(f"Repaired application counts for {fixed} internship(s)")
+
+@app.cli.command('rebuild-rollups')
+@click.option('--check', is_flag=True, help='Only compare the rollups with a full recomputation.')
+def rebuild_rollups_command(check):
+    """Recompute the analytics rollup tables from applications"""
+    conn = get_db_connection()
+    if not check:
+        rebuild_rollups(conn)
+    mismatches = check_rollups(conn)
+    for table, count in mismatches.items():
+        print(f"{table}: {'OK' if count == 0 else f'{count} row(s) differ'}")
+    if any(mismatches.values()):
+        raise SystemExit(1)
+
+@app.cli.command('rebuild-search')
+def rebuild_search_command():
+    """Rebuild the full-text search index"""
+    indexed = rebuild_search_index(get_db_connection())
+    print(f"Indexed {indexed} internship(s)")
+
+@app.cli.command('compress-static')
+@click.option('--force', is_flag=True, help='Rebuild variants that are already up to date.')
+def compress_static_command(force):
+    """Precompress static assets into .gz/.br variants served to clients that accept them"""
+    if brotli is None:
+        print("brotli is not installed; writing gzip variants only")
+    total = Counter()
+    for name, sizes in precompress_static(force):
+        total.update(sizes)
+        print(f"  {name}: " + ', '.join(f"{encoding} {size:,}" for encoding, size in sizes.items()))
+    print("Total: " + ', '.join(f"{encoding} {size:,}" for encoding, size in total.items()))
+
+@app.cli.command('import')
+@click.argument('kind', type=click.Choice(IMPORT_KINDS))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True, help='Rows per transaction.')
+@click.option('--posted-by', help='Recruiter id or email for internships without a posted_by field.')
+def import_command(kind, path, chunk_size, posted_by):
+    """Bulk-load companies, skills or internships from a .csv or .jsonl file"""
+    try:
+        importer = FeedImporter(get_db_connection(), kind, chunk_size, posted_by)
+    except ImportRowError as e:
+        raise click.BadParameter(str(e), param_hint='--posted-by')
+
+    started = time.perf_counter()
+    stats = importer.run(read_feed(path))
+    elapsed = time.perf_counter() - started
+
+    for number, error in importer.errors:
+        print(f"  line {number}: {error}")
+    if stats['invalid'] > len(importer.errors):
+        print(f"  ... and {stats['invalid'] - len(importer.errors)} more")
+    processed = stats['inserted'] + stats['skipped'] + stats['invalid']
+    print(f"Imported {stats['inserted']} {kind} ({stats['skipped']} already present, {stats['invalid']} invalid"
+          + (f", {stats['skills created']} new skills" if stats['skills created'] else '')
+          + f") in {elapsed:.1f}s, {processed / max(elapsed, 1e-9):,.0f} rows/s")
+
+@app.cli.command('export-applications')
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv', show_default=True)
+@click.option('--recruiter', help='Recruiter id or email; defaults to every posting.')
+@click.option('--output', type=click.File('w', encoding='utf-8', lazy=True), default='-',
+              help='File to write, or - for stdout.')
+def export_applications_command(fmt, recruiter, output):
+    """Stream applications with posting, company and applicant details"""
+    conn = get_db_connection()
+    recruiter_id = None
+    if recruiter:
+        row = conn.execute("SELECT id FROM users WHERE role = 'RECRUITER' AND (id = ? OR email = ?)",
+                           (recruiter, recruiter)).fetchone()
+        if row is None:
+            raise click.BadParameter(f'unknown recruiter {recruiter!r}', param_hint='--recruiter')
+        recruiter_id = row['id']
+
+    for chunk in export_applications(conn, fmt, recruiter_id):
+        output.write(chunk)
+
+@app.cli.command('bench-chat')
+@click.option('--intents', default=0, help='Use a synthetic knowledge base with this many intents.')
+@click.option('--messages', default=20000, help='Number of messages to classify.')
+def bench_chat_command(intents, messages):
+    """Compare intent classification throughput with a sequential keyword scan"""
+    index = chat_index
+    if intents:
+        index = IntentIndex({
+            f'topic{n}': {'keywords': [f'alpha{n}', f'beta{n}', f'gamma{n} delta{n}'], 'tips': [f'Tip {n}']}
+            for n in range(intents)
+        })
+    keywords = [keyword for entry in index.knowledge.values() for keyword in entry['keywords']]
+    filler = 'how do i get better at this for my next role please help'.split()
+    rng = random.Random(0)
+    sample = [' '.join(rng.sample(filler, 6) + rng.sample(keywords, rng.randint(0, 2))) for _ in range(messages)]
+
+    def sequential(message):
+        message_lower = message.lower()
+        for intent, entry in index.knowledge.items():
+            if any(keyword in message_lower for keyword in entry['keywords']):
+                return intent
+
+    for name, classify in (('Sequential scan', sequential), ('Intent index', index.classify)):
+        started = time.perf_counter()
+        for message in sample:
+            classify(message)
+        elapsed = time.perf_counter() - started
+        print(f"{name}: {messages / elapsed:,.0f} classifications/s over {len(index.knowledge)} intent(s)")
+
+@app.cli.command('bench-recommendations')
+@click.option('--students', default=100000, help='Number of synthetic students.')
+@click.option('--internships', default=50000, help='Number of synthetic active internships.')
+@click.option('--skills', default=500, help='Size of the skill vocabulary.')
+@click.option('--k', default=RECOMMENDATIONS_DEFAULT_K, help='Recommendations per student.')
+@click.option('--check', default=300, help='Students also ranked by brute force to verify the results.')
+def bench_recommendations_command(students, internships, skills, k, check):
+    """Time loading the skill graph and top-k recommendations for every student on synthetic data"""
+    rng = random.Random(0)
+    skill_ids = [f's{n}' for n in range(skills)]
+    postings = {f'i{n}': rng.sample(skill_ids, rng.randint(3, 7)) for n in range(internships)}
+    vectors = {f'u{n}': {skill_id: rng.randint(1, MAX_PROFICIENCY) for skill_id in rng.sample(skill_ids, 6)}
+               for n in range(students)}
+
+    matcher = SkillMatcher()
+    started = time.perf_counter()
+    matcher._build([(internship_id, skill_id) for internship_id, required in postings.items() for skill_id in required])
+    print(f"Graph load: {time.perf_counter() - started:.2f}s for {internships:,} internship(s), {skills:,} skill(s)")
+
+    started = time.perf_counter()
+    rankings = matcher.top_k_batch(vectors, k)
+    elapsed = time.perf_counter() - started
+    print(f"Batch top-{k}: {elapsed:.2f}s for {students:,} student(s), {1000 * elapsed / max(students, 1):.3f} ms/student")
+
+    # Brute force: score every posting in Python, ties going to the newest (first) one
+    started = time.perf_counter()
+    mismatches = 0
+    for user_id in list(vectors)[:check]:
+        weights = {skill_id: level / MAX_PROFICIENCY for skill_id, level in vectors[user_id].items()}
+        scored = []
+        for position, (internship_id, required) in enumerate(postings.items()):
+            total = sum(weights.get(skill_id, 0) for skill_id in required)
+            if total:
+                scored.append((-round(total / len(required), 4), position, internship_id))
+        expected = [(internship_id, -score) for score, _, internship_id in sorted(scored)[:k]]
+        mismatches += rankings[user_id] != expected
+    elapsed = time.perf_counter() - started
+    print(f"Brute force: {1000 * elapsed / max(check, 1):.3f} ms/student, {mismatches} of {check} ranking(s) differ")
+
+@contextmanager
+def bench_database():
+    """Point the app at a freshly seeded database in a temporary directory while a benchmark runs"""
+    global _db_pool
+    saved = app.config['DATABASE'], _db_pool
+    with tempfile.TemporaryDirectory() as directory:
+        app.config['DATABASE'], _db_pool = os.path.join(directory, 'bench.db'), None
+        for cache in (user_cache, stats_cache, recommendation_cache._lru):
+            cache.clear()
+        skill_matcher.invalidate()
+        try:
+            # Test client requests reuse an app context that is already pushed, so keep them in this one:
+            # its connection then goes back to the benchmark's pool, not the one restored afterwards
+            with app.app_context():
+                init_db()
+                yield get_db_pool()
+        finally:
+            view_counter.flush()
+            get_db_pool().close_all()
+            app.config['DATABASE'], _db_pool = saved
+
+def add_bench_internships(conn, start, stop):
+    """Import synthetic active internships bench{start}..bench{stop - 1}, three seeded skills each"""
+    rng = random.Random(start)
+    skills = [row['name'] for row in conn.execute('SELECT name FROM skills')]
+    FeedImporter(conn, 'internships', posted_by='u1').run(
+        (n, {'id': f'bench{n}', 'title': f'Bench Intern {n}', 'description': 'Synthetic posting for benchmarks.',
+             'location': rng.choice(['Remote', 'Pune']), 'type': 'FULL_TIME', 'duration': 3, 'stipend': 10000,
+             'company_id': 'c1', 'skills': rng.sample(skills, 3)})
+        for n in range(start, stop))
+    skill_matcher.invalidate()
+
+@app.cli.command('bench-dashboard')
+@click.option('--sizes', default='10,100,1000,10000,100000', help='Comma-separated catalog sizes to measure.')
+@click.option('--requests', 'repeat', default=20, help='Dashboard loads timed per size.')
+def bench_dashboard_command(sizes, repeat):
+    """Count statements and time student dashboard loads as the active catalog grows"""
+    with bench_database():
+        statements = []
+        # Requests made on this thread share bench_database()'s app context and so this connection
+        conn = get_db_connection()
+        conn.set_trace_callback(statements.append)
+
+        client = app.test_client()
+        client.post('/signup', data={'name': 'Bench Student', 'email': 'bench@example.edu', 'password': 'password123',
+                                     'role': 'STUDENT', 'college_name': 'Bench College', 'college_tier': 'TIER_1',
+                                     'year': '3'})
+        response = client.post('/api/profile/skills', json={'skills': [
+            {'skill_id': 's1', 'proficiency': 5}, {'skill_id': 's2', 'proficiency': 3},
+            {'skill_id': 's5', 'proficiency': 4}]})
+        if response.status_code != 200 or not response.get_json()['skills']:
+            raise click.ClickException(f'could not give the bench student skills: {response.get_data(as_text=True)}')
+
+        catalog = conn.execute("SELECT COUNT(*) FROM internships WHERE status = 'ACTIVE'").fetchone()[0]
+        for size in sorted(int(size) for size in sizes.split(',')):
+            if size > catalog:
+                add_bench_internships(conn, catalog, size)
+                catalog = size
+            for cold in (True, False):
+                counts, timings = [], []
+                for _ in range(repeat):
+                    if cold:
+                        # Nothing cached in this worker: every count, user and ranking comes from the database
+                        for cache in (user_cache, stats_cache, recommendation_cache._lru):
+                            cache.clear()
+                    statements.clear()
+                    started = time.perf_counter()
+                    client.get('/dashboard')
+                    timings.append(1000 * (time.perf_counter() - started))
+                    counts.append(sum(not statement.startswith(('BEGIN', 'COMMIT', 'ROLLBACK'))
+                                      for statement in statements))
+                print(f"{catalog:>9,} internships, {'cold' if cold else 'warm'}: "
+                      f"{min(counts)}-{max(counts)} statement(s), "
+                      f"median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+
+@app.cli.command('bench-templates')
+@click.option('--requests', 'repeat', default=200, help='Requests timed per route and mode.')
+def bench_templates_command(repeat):
+    """Time page requests with templates compiled once versus recompiled on every render"""
+    with bench_database():
+        visitor, student = app.test_client(), app.test_client()
+        student.post('/signup', data={'name': 'Bench Student', 'email': 'bench@example.edu', 'password': 'password123',
+                                      'role': 'STUDENT', 'college_name': 'Bench College', 'college_tier': 'TIER_1',
+                                      'year': '3'})
+        routes = (('/', visitor), ('/dashboard', student), ('/profile', student))
+
+        # Without Jinja's template cache every render reloads and recompiles the page and base.html,
+        # as render_template_string() did with the page source before templates were named
+        jinja_cache = app.jinja_env.cache
+        try:
+            for label, cache in (('recompiled per request', None), ('compiled once', jinja_cache)):
+                app.jinja_env.cache = cache
+                for path, client in routes:
+                    client.get(path)
+                    started = time.perf_counter()
+                    for _ in range(repeat):
+                        client.get(path)
+                    print(f"{path:<12} {label}: {1000 * (time.perf_counter() - started) / repeat:.2f} ms/request")
+        finally:
+            app.jinja_env.cache = jinja_cache
+
+@app.cli.command('bench-logins')
+@click.option('--clients', default=20, help='Concurrent clients logging in.')
+@click.option('--logins', default=3, help='Logins per client.')
+@click.option('--threads', default='1,2,20', help='Comma-separated PASSWORD_HASH_THREADS values to compare.')
+@click.option('--probes', default=200, help='/api/internships requests timed with no logins running.')
+def bench_logins_command(clients, logins, threads, probes):
+    """Measure login throughput and /api/internships latency while a login storm runs"""
+    global password_hasher
+
+    def probe(client, stop=None, count=None):
+        latencies = []
+        while (stop is not None and not stop.is_set()) or (count is not None and len(latencies) < count):
+            started = time.perf_counter()
+            client.get('/api/internships')
+            latencies.append(1000 * (time.perf_counter() - started))
+        return latencies
+
+    def login(results):
+        client = app.test_client()
+        for _ in range(logins):
+            response = client.post('/login', data={'email': 'recruiter@techstart.com', 'password': 'password123'})
+            results.append(response.headers.get('Location', '').endswith('/dashboard'))
+
+    def report(label, latencies, extra=''):
+        p90 = statistics.quantiles(latencies, n=10)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{label:<22} /api/internships p50 {statistics.median(latencies):.1f} ms, p90 {p90:.1f} ms{extra}")
+
+    saved = password_hasher, app.config['PASSWORD_HASH_THREADS']
+    with bench_database():
+        prober = app.test_client()
+        prober.post('/login', data={'email': 'recruiter@techstart.com', 'password': 'password123'})
+        report('idle', probe(prober, count=probes))
+        try:
+            for thread_count in (int(value) for value in threads.split(',')):
+                app.config['PASSWORD_HASH_THREADS'] = thread_count
+                password_hasher = PasswordHasher()
+                results, stop = [], threading.Event()
+                latencies = []
+                prober_thread = threading.Thread(target=lambda: latencies.extend(probe(prober, stop=stop)))
+                storm = [threading.Thread(target=login, args=(results,)) for _ in range(clients)]
+                started = time.perf_counter()
+                prober_thread.start()
+                for thread in storm:
+                    thread.start()
+                for thread in storm:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+                stop.set()
+                prober_thread.join()
+                report(f'{thread_count} hash thread(s)', latencies,
+                       f', {sum(results) / elapsed:.1f} logins/s, {len(results) - sum(results)} turned away')
+        finally:
+            password_hasher, app.config['PASSWORD_HASH_THREADS'] = saved
 
 # =============================================================================
 # MAIN
@@ -1580,7 +4177,8 @@ def apply():
 if __name__ == '__main__':
     # Initialize database
     print("Initializing database...")
-    init_db()
+    with app.app_context():
+        init_db()
     print("Database initialized successfully!")
 
     # Run the application